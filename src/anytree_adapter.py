@@ -0,0 +1,33 @@
+"""
+    Adapter from the parser's AST to anytree, for code that still needs the
+    anytree API (RenderTree styles, exporters, resolvers, ...).
+"""
+
+from anytree import NodeMixin
+
+from parser_s import Node
+
+
+class AnytreeNode(NodeMixin):
+    def __init__(self, name, value=None):
+        self.name = name
+        self.value = value
+
+    def __str__(self):
+        if self.value:
+            return f"{self.value}"
+        else:
+            return f"{self.name}"
+
+
+def to_anytree(root: Node) -> AnytreeNode:
+    """Copies an AST into AnytreeNode objects and returns the new root."""
+    new_root = AnytreeNode(root.name, root.value)
+    stack = [(root, new_root)]
+    while stack:
+        node, new_node = stack.pop()
+        new_children = [AnytreeNode(child.name, child.value) for child in node.children]
+        if new_children:
+            new_node.children = new_children
+            stack.extend(zip(node.children, new_children))
+    return new_root
@@ -0,0 +1,232 @@
+"""
+    Batch driver that runs the lexer and the parser over many files in
+    parallel. Every file is compiled in a worker process; one JSON line is
+    written to stdout per file as soon as its result is in, in the order the
+    files finish, and a summary of timings and errors is printed to stderr
+    at the end.
+
+    Results are kept in a CompileCache, so files that did not change since
+    an earlier run are not lexed nor parsed again.
+
+    Usage: python src/batch.py [--jobs N] [--pattern GLOB]
+                               [--parser recursive|table]
+                               [--cache-dir DIR | --no-cache] PATH_OR_GLOB...
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+from compile_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, CompileCache
+from lexer import get_lexical_analysis, get_lexical_analysis_from_text
+from parser_s import PARSER_BACKENDS, parser_class
+
+
+def expand_paths(arguments: list[str], pattern: str = "*") -> list[Path]:
+    """Files named by the arguments: plain files, directories (searched
+    recursively for pattern) and glob expressions."""
+    paths = []
+    for argument in arguments:
+        path = Path(argument)
+        if path.is_dir():
+            paths.extend(sorted(p for p in path.rglob(pattern) if p.is_file()))
+        elif path.is_file():
+            paths.append(path)
+        else:
+            paths.extend(
+                Path(p) for p in sorted(glob.glob(argument, recursive=True))
+            )
+    return [p for p in paths if p.is_file()]
+
+
+def compile_file(
+    path: Path, cache: CompileCache | None = None, backend: str = "recursive"
+) -> dict:
+    """Lexes and parses one file and returns a JSON serializable result. The
+    cache, if any, must hold results of the same parser backend."""
+    result = {"file": str(path)}
+    try:
+        start = time.perf_counter()
+        if cache is not None:
+            content = path.read_bytes()
+            cached = cache.get(content)
+        else:
+            cached = None
+        if cached is not None:
+            tokens, errors, _, syntax_errors, _ = cached
+            lexed = parsed = start
+        else:
+            if cache is not None:
+                tokens, errors = get_lexical_analysis_from_text(content)
+            else:
+                tokens, errors = get_lexical_analysis(path, use_mmap=True)
+            lexed = time.perf_counter()
+            parser = parser_class(backend)(tokens)
+            ast = parser.parse()
+            parsed = time.perf_counter()
+            syntax_errors = parser.errors
+            if cache is not None:
+                cache.put(
+                    content,
+                    (tokens, errors, ast, syntax_errors, parser.error_tokens),
+                )
+    except Exception as e:  # one bad file must not stop the batch
+        result["error"] = f"{type(e).__name__}: {e}"
+        return result
+
+    result["tokens"] = len(tokens)
+    result["lexical_errors"] = [repr(error) for error in errors]
+    result["syntax_errors"] = syntax_errors
+    result["lex_seconds"] = lexed - start
+    result["parse_seconds"] = parsed - lexed
+    result["cached"] = cached is not None
+    return result
+
+
+# CompileCache of this worker process, kept across the batches it compiles so
+# that its size count is only built once
+_worker_cache = None
+_worker_backend = "recursive"
+
+
+def init_worker(backend: str, cache_directory: Path | None, cache_max_bytes: int):
+    """Runs once in every worker process of the pool."""
+    global _worker_backend, _worker_cache
+    _worker_backend = backend
+    if cache_directory is not None:
+        _worker_cache = CompileCache(cache_directory, cache_max_bytes, backend)
+
+
+def compile_files(paths: list[Path]) -> list:
+    """Results of compile_file for a few files, compiled in one worker call."""
+    return [compile_file(path, _worker_cache, _worker_backend) for path in paths]
+
+
+def add_to_summary(summary: dict, result: dict):
+    summary["files"] += 1
+    if "error" in result:
+        summary["failed_files"] += 1
+        return
+    summary["tokens"] += result["tokens"]
+    summary["cached_files"] += result["cached"]
+    summary["lexical_errors"] += len(result["lexical_errors"])
+    summary["syntax_errors"] += len(result["syntax_errors"])
+    summary["lex_seconds"] += result["lex_seconds"]
+    summary["parse_seconds"] += result["parse_seconds"]
+    if result["lexical_errors"] or result["syntax_errors"]:
+        summary["files_with_errors"] += 1
+
+
+def run_batch(
+    paths: list[Path],
+    jobs: int,
+    output=sys.stdout,
+    cache: CompileCache | None = None,
+    backend: str = "recursive",
+) -> dict:
+    """Compiles the files on a pool of jobs processes, writing a JSON line per
+    file to output as files finish, and returns the aggregated summary."""
+    summary = {
+        "files": 0,
+        "cached_files": 0,
+        "tokens": 0,
+        "files_with_errors": 0,
+        "failed_files": 0,
+        "lexical_errors": 0,
+        "syntax_errors": 0,
+        "lex_seconds": 0.0,
+        "parse_seconds": 0.0,
+    }
+    # Hand out files in batches so thousands of small files do not pay one
+    # round trip to a worker each. Batches are small enough that a slow file
+    # only holds back the few files batched with it.
+    chunksize = max(1, len(paths) // (jobs * 8))
+    start = time.perf_counter()
+
+    # Workers build their own cache from its settings instead of receiving a
+    # copy with every batch, which would count the directory again each time
+    if cache is not None:
+        worker_settings = (backend, cache.directory, cache.max_bytes)
+    else:
+        worker_settings = (backend, None, 0)
+
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=init_worker, initargs=worker_settings
+    ) as executor:
+        futures = [
+            executor.submit(compile_files, paths[index : index + chunksize])
+            for index in range(0, len(paths), chunksize)
+        ]
+        for future in as_completed(futures):
+            for result in future.result():
+                output.write(json.dumps(result) + "\n")
+                add_to_summary(summary, result)
+
+    summary["wall_seconds"] = time.perf_counter() - start
+    summary["files_per_second"] = summary["files"] / max(
+        summary["wall_seconds"], 1e-9
+    )
+    return summary
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(
+        description="Lex and parse many files in parallel."
+    )
+    arg_parser.add_argument("paths", nargs="+", help="files, directories or globs")
+    arg_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="worker processes (default: number of cores)",
+    )
+    arg_parser.add_argument(
+        "--pattern",
+        default="*",
+        help="file name pattern used inside directories (default: *)",
+    )
+    arg_parser.add_argument(
+        "--parser",
+        choices=PARSER_BACKENDS,
+        default=PARSER_BACKENDS[0],
+        help="parser backend (default: recursive)",
+    )
+    arg_parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help=f"where compile results are cached (default: {DEFAULT_CACHE_DIR})",
+    )
+    arg_parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=DEFAULT_MAX_BYTES >> 20,
+        metavar="MB",
+        help=f"size limit of the cache (default: {DEFAULT_MAX_BYTES >> 20} MB)",
+    )
+    arg_parser.add_argument(
+        "--no-cache", action="store_true", help="compile every file again"
+    )
+    args = arg_parser.parse_args(argv)
+
+    paths = expand_paths(args.paths, args.pattern)
+    if not paths:
+        print("No files found", file=sys.stderr)
+        return 1
+
+    cache = None
+    if not args.no_cache:
+        cache = CompileCache(args.cache_dir, args.cache_size << 20, args.parser)
+    summary = run_batch(paths, max(1, args.jobs), cache=cache, backend=args.parser)
+    print(json.dumps(summary, indent=4), file=sys.stderr)
+    return 0 if summary["failed_files"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
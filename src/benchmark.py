@@ -0,0 +1,389 @@
+"""
+    Benchmarks for the lexer, the parser and the full compile pipeline over
+    programs made by program_generator. The compile stage runs every stage
+    the editor does: lexing, parsing, semantic analysis, constant folding,
+    code generation and a run on the virtual machine, stopped after a step
+    budget since generated loops need not end. Its token and node
+    throughput counts lexing, parsing and semantic analysis only; code
+    generation and the run are timed apart, the run as steps per second. A size may be followed by the
+    expression and block depths of its programs, as in 1M:1000:12, which
+    by default is the deep nesting workload. Every measurement runs in a
+    fresh process so that its peak RSS is not hidden by an earlier, larger
+    one. Results can be saved as a baseline JSON file and later runs
+    compared against it.
+
+    Usage: python src/benchmark.py [--sizes 1K,100K,1M:1000] [--repeat N]
+                                   [--parser recursive|table] [--steps N]
+                                   [--expression-depth N] [--block-depth N]
+                                   [--save-baseline FILE] [--compare FILE]
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import argparse
+import itertools
+import json
+import multiprocessing
+import platform
+import sys
+import tempfile
+import time
+
+from parser_s import PARSER_BACKENDS, parser_class
+from program_generator import (
+    DEFAULT_BLOCK_DEPTH,
+    DEFAULT_EXPRESSION_DEPTH,
+    ProgramGenerator,
+    parse_size,
+)
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+STAGES = ("lexer", "parser", "compile")
+# SIZE[:EXPRESSION_DEPTH[:BLOCK_DEPTH]]; the last one nests deeply
+DEFAULT_SIZES = "1K,10K,100K,1M,10M,1M:1000:12"
+# Instructions run by the virtual machine in the compile stage
+DEFAULT_STEPS = 1_000_000
+# metrics where a lower value in the new run means a regression
+THROUGHPUT_METRICS = ("tokens_per_second", "nodes_per_second", "steps_per_second")
+
+
+def peak_rss_mb() -> float | None:
+    """Peak resident set size of this process in MB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    if sys.platform == "darwin":
+        return peak / (1 << 20)
+    return peak / (1 << 10)
+
+
+def count_nodes(root) -> int:
+    """Number of nodes in the AST, walked without recursion."""
+    count = 0
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if node is None:
+            continue
+        count += 1
+        stack.extend(node.children)
+    return count
+
+
+def _lex(path: Path):
+    from lexer import get_lexical_analysis
+
+    return get_lexical_analysis(path, use_mmap=True)
+
+
+def _parse(tokens, backend: str):
+    parser = parser_class(backend)(tokens)
+    return parser.parse(), parser
+
+
+def _analyze(root):
+    from semantic import SemanticAnalyzer
+
+    analyzer = SemanticAnalyzer(root)
+    analyzer.analyze()
+    return analyzer
+
+
+def _generate(root):
+    """The code of the program, folded and generated as the editor does"""
+    from intermediate_code import CodeGenerator
+    from optimizer import ConstantFolder
+    from virtual_machine import Bytecode
+
+    code = CodeGenerator(ConstantFolder(root).fold()).generate()
+    return code, Bytecode.from_intermediate_code(code)
+
+
+def _run(bytecode, steps: int):
+    from virtual_machine import VirtualMachine
+
+    # Every cin reads the same value
+    machine = VirtualMachine(bytecode, itertools.repeat("3"), steps)
+    machine.run()
+    return machine
+
+
+def measure(
+    stage: str,
+    path: Path,
+    repeat: int,
+    backend: str = "recursive",
+    steps: int = DEFAULT_STEPS,
+) -> dict:
+    """Runs one stage over one file repeat times and keeps the best time."""
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))
+    tokens = _lex(path)[0] if stage == "parser" else None
+    best = best_codegen = best_run = float("inf")
+    code = machine = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        if stage == "lexer":
+            tokens, errors = _lex(path)
+        elif stage == "parser":
+            root, parser = _parse(tokens, backend)
+        else:
+            tokens, errors = _lex(path)
+            root, parser = _parse(tokens, backend)
+            analyzer = _analyze(root)
+        best = min(best, time.perf_counter() - start)
+        if stage == "compile" and not analyzer.errors:
+            # Apart from the compile, so that neither the length of the run
+            # nor the speed of the machine shows in its throughput
+            start = time.perf_counter()
+            code, bytecode = _generate(root)
+            generated = time.perf_counter()
+            machine = _run(bytecode, steps)
+            best_codegen = min(best_codegen, generated - start)
+            best_run = min(best_run, time.perf_counter() - generated)
+
+    result = {"seconds": best, "tokens": len(tokens)}
+    result["tokens_per_second"] = len(tokens) / best
+    if stage != "lexer":
+        result["nodes"] = count_nodes(root)
+        result["nodes_per_second"] = result["nodes"] / best
+        result["syntax_errors"] = len(parser.errors)
+    if stage == "compile":
+        result["semantic_errors"] = len(analyzer.errors)
+        if machine is not None:
+            result["instructions"] = len(code)
+            result["codegen_seconds"] = best_codegen
+            result["run_seconds"] = best_run
+            result["steps"] = machine.steps
+            result["steps_per_second"] = machine.steps / best_run
+            result["runtime_error"] = machine.error
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+
+def measure_in_subprocess(
+    stage: str, path: Path, repeat: int, backend: str, steps: int
+) -> dict:
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(measure, stage, path, repeat, backend, steps).result()
+
+
+def parse_workload(
+    workload: str, expression_depth: int, block_depth: int
+) -> tuple[int, int, int]:
+    """Size and depths of a SIZE[:EXPRESSION_DEPTH[:BLOCK_DEPTH]] workload,
+    with the given depths for those it leaves out."""
+    size, *depths = workload.split(":")
+    if depths:
+        expression_depth = int(depths[0])
+    if len(depths) > 1:
+        block_depth = int(depths[1])
+    return parse_size(size), expression_depth, block_depth
+
+
+def run_benchmarks(
+    sizes: list[str],
+    stages: list[str],
+    repeat: int,
+    seed: int,
+    workdir: Path,
+    backend: str = "recursive",
+    steps: int = DEFAULT_STEPS,
+    expression_depth: int = DEFAULT_EXPRESSION_DEPTH,
+    block_depth: int = DEFAULT_BLOCK_DEPTH,
+) -> dict:
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "repeat": repeat,
+        "parser": backend,
+        "steps": steps,
+        "expression_depth": expression_depth,
+        "block_depth": block_depth,
+        "results": {},
+    }
+    for size in sizes:
+        length, max_expression_depth, max_block_depth = parse_workload(
+            size, expression_depth, block_depth
+        )
+        path = workdir / (
+            f"program_{length}_{max_expression_depth}_{max_block_depth}_{seed}.txt"
+        )
+        if not path.exists():
+            generator = ProgramGenerator(
+                seed,
+                max_block_depth=max_block_depth,
+                max_expression_depth=max_expression_depth,
+            )
+            generator.write(path, length)
+        for stage in stages:
+            key = f"{stage}/{size}"
+            result = measure_in_subprocess(stage, path, repeat, backend, steps)
+            result["bytes"] = path.stat().st_size
+            report["results"][key] = result
+            print(format_result(key, result), file=sys.stderr)
+    return report
+
+
+def format_result(key: str, result: dict) -> str:
+    line = f"{key:<20} {result['seconds']:>9.4f}s"
+    line += f" {result['tokens_per_second']:>12,.0f} tokens/s"
+    if "nodes_per_second" in result:
+        line += f" {result['nodes_per_second']:>12,.0f} nodes/s"
+    if "steps_per_second" in result:
+        line += f" {result['steps_per_second']:>12,.0f} steps/s"
+    if result["peak_rss_mb"] is not None:
+        line += f" {result['peak_rss_mb']:>8.1f} MB"
+    return line
+
+
+def compare(report: dict, baseline: dict, max_regression: float) -> list[str]:
+    """Lines describing every change against the baseline; the ones that
+    lose more than max_regression of throughput are marked REGRESSION.
+    Runs of different parser backends are not compared."""
+    if report["parser"] != baseline.get("parser"):
+        return [
+            f"Not compared: the baseline used the {baseline.get('parser')} "
+            f"parser and this run the {report['parser']} one"
+        ]
+    lines = []
+    for key, result in report["results"].items():
+        old = baseline["results"].get(key)
+        if old is None:
+            continue
+        for metric in THROUGHPUT_METRICS + ("peak_rss_mb",):
+            if result.get(metric) is None or not old.get(metric):
+                continue
+            ratio = result[metric] / old[metric]
+            line = f"{key:<20} {metric:<18} {ratio:>6.2f}x"
+            if metric in THROUGHPUT_METRICS and ratio < 1 - max_regression:
+                line += "  REGRESSION"
+            lines.append(line)
+    return lines
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Benchmark the compiler.")
+    arg_parser.add_argument(
+        "--sizes",
+        default=DEFAULT_SIZES,
+        help="comma separated program sizes, each optionally followed by "
+        f":EXPRESSION_DEPTH[:BLOCK_DEPTH] (default: {DEFAULT_SIZES})",
+    )
+    arg_parser.add_argument(
+        "--stages",
+        default=",".join(STAGES),
+        help="comma separated stages to run (default: all)",
+    )
+    arg_parser.add_argument(
+        "--parser",
+        choices=PARSER_BACKENDS,
+        default=PARSER_BACKENDS[0],
+        help="parser backend (default: recursive)",
+    )
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument(
+        "--steps",
+        type=int,
+        default=DEFAULT_STEPS,
+        help=f"instructions the compile stage runs (default: {DEFAULT_STEPS})",
+    )
+    arg_parser.add_argument(
+        "--expression-depth",
+        type=int,
+        default=DEFAULT_EXPRESSION_DEPTH,
+        help="nesting of generated expressions, for sizes without one "
+        f"(default: {DEFAULT_EXPRESSION_DEPTH})",
+    )
+    arg_parser.add_argument(
+        "--block-depth",
+        type=int,
+        default=DEFAULT_BLOCK_DEPTH,
+        help="nesting of generated blocks, for sizes without one "
+        f"(default: {DEFAULT_BLOCK_DEPTH})",
+    )
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument(
+        "--workdir",
+        type=Path,
+        help="where generated programs are kept between runs",
+    )
+    arg_parser.add_argument("--save-baseline", type=Path, metavar="FILE")
+    arg_parser.add_argument("--compare", type=Path, metavar="FILE")
+    arg_parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.10,
+        help="allowed throughput loss against the baseline (default: 0.10)",
+    )
+    args = arg_parser.parse_args(argv)
+
+    sizes = args.sizes.split(",")
+    stages = args.stages.split(",")
+    for stage in stages:
+        if stage not in STAGES:
+            arg_parser.error(f"unknown stage {stage!r}")
+    for size in sizes:
+        try:
+            parse_workload(size, args.expression_depth, args.block_depth)
+        except (KeyError, ValueError):
+            arg_parser.error(f"invalid size {size!r}")
+    baseline = None
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        if baseline.get("parser") != args.parser:
+            arg_parser.error(
+                f"the baseline used the {baseline.get('parser')} parser; "
+                f"compare it with --parser {baseline.get('parser')}"
+            )
+
+    repeat = max(1, args.repeat)
+    if args.workdir is not None:
+        args.workdir.mkdir(parents=True, exist_ok=True)
+        report = run_benchmarks(
+            sizes,
+            stages,
+            repeat,
+            args.seed,
+            args.workdir,
+            args.parser,
+            args.steps,
+            args.expression_depth,
+            args.block_depth,
+        )
+    else:
+        with tempfile.TemporaryDirectory() as workdir:
+            report = run_benchmarks(
+                sizes,
+                stages,
+                repeat,
+                args.seed,
+                Path(workdir),
+                args.parser,
+                args.steps,
+                args.expression_depth,
+                args.block_depth,
+            )
+
+    if args.save_baseline is not None:
+        args.save_baseline.write_text(json.dumps(report, indent=4), encoding="utf-8")
+    else:
+        print(json.dumps(report, indent=4))
+
+    if baseline is not None:
+        lines = compare(report, baseline, args.max_regression)
+        print("\n".join(lines), file=sys.stderr)
+        if any(line.endswith("REGRESSION") for line in lines):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
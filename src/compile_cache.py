@@ -0,0 +1,233 @@
+"""
+    Persistent cache of compile results. An entry holds the token stream,
+    the AST and the diagnostics of one source text, under a key made of the
+    hash of the text, of the compiler version and of the parser backend, so a
+    change to the lexer or the parser makes every older entry miss. Entries are files in one
+    directory; reading one refreshes its modification time, and the least
+    recently used ones are removed once the directory grows past its size
+    limit.
+"""
+
+from array import array
+from pathlib import Path
+import hashlib
+import os
+import pickle
+import tempfile
+
+from lexer import gc_paused, get_lexical_analysis_from_text
+from parser_s import Node, parser_class
+
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "compiler"
+DEFAULT_MAX_BYTES = 256 << 20
+# Changes whenever the modules that produce the cached results do
+_COMPILER_SOURCES = (
+    "lexer.py",
+    "parser_s.py",
+    "table_parser.py",
+    "ll1_table.py",
+    "compile_cache.py",
+)
+_FORMAT = 1  # of the entries
+
+
+def compiler_version() -> str:
+    digest = hashlib.sha256(str(_FORMAT).encode())
+    for name in _COMPILER_SOURCES:
+        digest.update((Path(__file__).parent / name).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+COMPILER_VERSION = compiler_version()
+
+
+def flatten_ast(root: Node | None) -> tuple:
+    """
+    The AST in pre-order as columns: the index of every node's name in a pool
+    of names, its value, its number of children and its line and column (0
+    for None). Unlike the nodes themselves, they pickle without recursing
+    however deep the tree is.
+    """
+    names = {}
+    name_indexes = array("i")
+    values = []
+    counts = array("i")
+    linenos = array("i")
+    lexposes = array("i")
+    stack = [root] if root is not None else []
+    with gc_paused():
+        while stack:
+            node = stack.pop()
+            index = names.get(node.name)
+            if index is None:
+                index = names[node.name] = len(names)
+            name_indexes.append(index)
+            values.append(node.value)
+            counts.append(len(node.children))
+            linenos.append(node.lineno or 0)
+            lexposes.append(node.lexpos or 0)
+            stack.extend(reversed(node.children))
+    return list(names), name_indexes, values, counts, linenos, lexposes
+
+
+def unflatten_ast(columns: tuple) -> Node | None:
+    """Rebuilds the AST from the columns of flatten_ast."""
+    names, name_indexes, values, counts, linenos, lexposes = columns
+    new_node = Node.__new__
+    stack = []
+    with gc_paused():
+        for index in range(len(counts) - 1, -1, -1):
+            node = new_node(Node)
+            node.name = names[name_indexes[index]]
+            node.value = values[index]
+            node.parent = None
+            node.lineno = linenos[index] or None
+            node.lexpos = lexposes[index] or None
+            node.type = None
+            count = counts[index]
+            if count:
+                # The first child is the last one pushed
+                node.children = tuple(stack[: -count - 1 : -1])
+                del stack[-count:]
+            else:
+                node.children = ()
+            stack.append(node)
+    return stack[0] if stack else None
+
+
+def compile_text(text, backend: str = "recursive"):
+    """Lexes and parses a text (str or UTF-8 bytes) and returns (tokens,
+    lexical errors, AST, syntax errors, syntax error tokens)."""
+    tokens, lexical_errors = get_lexical_analysis_from_text(text)
+    parser = parser_class(backend)(tokens)
+    ast = parser.parse()
+    return tokens, lexical_errors, ast, parser.errors, parser.error_tokens
+
+
+class CompileCache:
+    """Compile results on disk, keyed by the content they were compiled from."""
+
+    def __init__(
+        self,
+        directory: Path = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        backend: str = "recursive",
+    ):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        # Parser backend of the results; backends recover from syntax errors
+        # differently, so their results are kept apart
+        self.backend = backend
+        # Size of the entries as of the last scan plus those put since, so
+        # that the directory is only scanned again once it passes max_bytes.
+        # None until the first put scans it.
+        self.total_bytes = None
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, content: bytes) -> str:
+        digest = hashlib.sha256(COMPILER_VERSION.encode())
+        digest.update(self.backend.encode())
+        digest.update(content)
+        return digest.hexdigest()
+
+    def path(self, key: str) -> Path:
+        return self.directory / f"{key}.pickle"
+
+    def get(self, content: bytes):
+        """Cached result of content, as compile_text returns it, or None."""
+        path = self.path(self.key(content))
+        try:
+            with open(path, "rb") as file:
+                with gc_paused():
+                    tokens, lexical_errors, ast, syntax_errors, error_tokens = (
+                        pickle.load(file)
+                    )
+            os.utime(path)  # most recently used
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+            # Unreadable entry: drop it and compile again
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return tokens, lexical_errors, unflatten_ast(ast), syntax_errors, error_tokens
+
+    def put(self, content: bytes, result):
+        """Stores the result of compiling content and evicts old entries."""
+        tokens, lexical_errors, ast, syntax_errors, error_tokens = result
+        entry = (
+            tokens,
+            list(lexical_errors),
+            flatten_ast(ast),
+            list(syntax_errors),
+            list(error_tokens),
+        )
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Written aside and renamed, so readers in other processes never see
+        # half an entry
+        path = self.path(self.key(content))
+        handle, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as file:
+                pickle.dump(entry, file, protocol=pickle.HIGHEST_PROTOCOL)
+                size = file.tell()
+            # Another worker may have stored the same content first: only
+            # the difference is new
+            try:
+                size -= path.stat().st_size
+            except FileNotFoundError:
+                pass
+            os.replace(temporary, path)
+        except BaseException:
+            Path(temporary).unlink(missing_ok=True)
+            raise
+        if self.total_bytes is None:
+            self.evict()
+        else:
+            self.total_bytes += size
+            if self.total_bytes > self.max_bytes:
+                self.evict()
+
+    def compile(self, content: bytes):
+        """Result of compiling content, from the cache when possible."""
+        result = self.get(content)
+        if result is None:
+            result = compile_text(content, self.backend)
+            self.put(content, result)
+        return result
+
+    def evict(self):
+        """
+        Removes the least recently used entries beyond max_bytes, counting
+        what other processes wrote as well, and updates total_bytes.
+        """
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if not entry.name.endswith(".pickle"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:  # evicted by another process
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        if total > self.max_bytes:
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                Path(path).unlink(missing_ok=True)
+                total -= size
+        self.total_bytes = total
+
+    def clear(self):
+        if self.directory.is_dir():
+            for path in self.directory.glob("*.pickle"):
+                path.unlink(missing_ok=True)
+        self.total_bytes = 0
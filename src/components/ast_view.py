@@ -0,0 +1,140 @@
+"""
+This module contains the model and the view that show the AST in the
+syntactic panel
+"""
+
+from PyQt5.QtCore import QAbstractItemModel, QModelIndex, Qt
+from PyQt5.QtWidgets import QTreeView
+
+
+# Rows added under a node each time the view asks for more of them
+FETCH_BATCH = 500
+
+
+class _Item:
+    """Row of the model: an AST node and the rows fetched for its children"""
+
+    __slots__ = ("node", "parent", "row", "children")
+
+    def __init__(self, node, parent, row):
+        self.node = node
+        self.parent = parent
+        self.row = row
+        self.children = []
+
+
+class AstModel(QAbstractItemModel):
+    """
+    Read-only model over an AST. The rows of a node are only created when the
+    view fetches them, FETCH_BATCH at a time, so showing a tree costs as much
+    as the part of it that has been expanded. With show_types, every node is
+    followed by the type the semantic analysis gave it.
+    """
+
+    def __init__(self, parent=None, show_types=False):
+        super().__init__(parent)
+        self.root = _Item(None, None, 0)
+        self.show_types = show_types
+
+    def set_ast(self, ast):
+        """This method replaces the tree shown by the model"""
+        self.beginResetModel()
+        self.root = _Item(None, None, 0)
+        if ast is not None:
+            self.root.children.append(_Item(ast, self.root, 0))
+        self.endResetModel()
+
+    def item(self, index: QModelIndex) -> _Item:
+        return index.internalPointer() if index.isValid() else self.root
+
+    def index(self, row, column, parent=QModelIndex()):
+        item = self.item(parent)
+        if column != 0 or not 0 <= row < len(item.children):
+            return QModelIndex()
+        return self.createIndex(row, column, item.children[row])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        parent = index.internalPointer().parent
+        if parent is self.root:
+            return QModelIndex()
+        return self.createIndex(parent.row, 0, parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        return len(self.item(parent).children)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent=QModelIndex()):
+        item = self.item(parent)
+        if item is self.root:
+            return bool(item.children)
+        return bool(item.node.children)
+
+    def canFetchMore(self, parent):
+        item = self.item(parent)
+        return item is not self.root and len(item.children) < len(item.node.children)
+
+    def fetchMore(self, parent):
+        item = self.item(parent)
+        start = len(item.children)
+        nodes = item.node.children[start : start + FETCH_BATCH]
+        if not nodes:
+            return
+        self.beginInsertRows(parent, start, start + len(nodes) - 1)
+        item.children.extend(
+            _Item(node, item, row) for row, node in enumerate(nodes, start)
+        )
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer().node
+        if role == Qt.DisplayRole:
+            label = node.name if node.value is None else str(node.value)
+            if self.show_types and node.type is not None:
+                return f"{label} : {node.type}"
+            return label
+        if role == Qt.ToolTipRole:
+            return node.name
+        return None
+
+
+class AstTreeView(QTreeView):
+    """
+    Tree view of an AstModel. Nodes are expanded on demand, and scrolling to
+    the bottom fetches the next rows of the node being read.
+    """
+
+    def __init__(self, parent=None, show_types=False):
+        super().__init__(parent)
+        self.setHeaderHidden(True)
+        # Lets the view lay out only the visible rows
+        self.setUniformRowHeights(True)
+        self.setModel(AstModel(self, show_types))
+        self.verticalScrollBar().valueChanged.connect(self.handle_scroll)
+
+    def set_ast(self, ast):
+        """This method shows a new AST, with only its root expanded"""
+        model: AstModel = self.model()
+        model.set_ast(ast)
+        if ast is not None:
+            self.expand(model.index(0, 0))
+
+    def handle_scroll(self, value):
+        """This method fetches more rows once the last ones come into view"""
+        if value != self.verticalScrollBar().maximum():
+            return
+        model: AstModel = self.model()
+        index = self.indexAt(self.viewport().rect().bottomLeft())
+        while index.isValid():
+            parent = index.parent()
+            if model.canFetchMore(parent):
+                model.fetchMore(parent)
+                return
+            index = parent
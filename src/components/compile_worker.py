@@ -0,0 +1,183 @@
+"""
+This module contains the worker that compiles a document off the GUI thread
+"""
+
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+from lexer import LexerSession, get_lexical_analysis_from_text
+
+
+# Cancellation is checked, and progress reported, once every this many tokens
+CHECK_INTERVAL = 4096
+# Share of the progress bar given to collecting the tokens
+LEXER_PROGRESS = 10
+
+
+class CompileCancelled(Exception):
+    """Raised inside the worker once it has been cancelled"""
+
+
+class CompileResult:
+    """Everything a compile produces for the dock panels"""
+
+    def __init__(
+        self,
+        tokens,
+        lexical_errors,
+        ast,
+        syntax_errors,
+        error_tokens,
+        symbols=None,
+        semantic_errors=(),
+        intermediate_code=None,
+        execution=None,
+        optimization=None,
+    ):
+        self.tokens = tokens
+        self.lexical_errors = lexical_errors
+        self.ast = ast
+        self.syntax_errors = syntax_errors
+        # Token of every syntax error, for showing it in the editor
+        self.error_tokens = error_tokens
+        self.symbols = symbols  # SymbolTable of the AST
+        self.semantic_errors = semantic_errors
+        # IntermediateCode of the program, None when it has errors
+        self.intermediate_code = intermediate_code
+        # VirtualMachine that ran the program, None when it has errors
+        self.execution = execution
+        # ConstantFolder run before generating the code, with its counters
+        self.optimization = optimization
+
+
+class CompileSignals(QObject):
+    """
+    Signals of a CompileWorker. They are emitted from the worker thread and,
+    since this object lives in the GUI thread, delivered to the slots there.
+    """
+
+    progress = pyqtSignal(int)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+
+class CompileWorker(QRunnable):
+    """
+    Lexes, parses and analyzes a document in a QThreadPool thread. The source
+    is either its text or a LexerSession snapshot that already holds its
+    tokens. With a CompileCache, a document compiled before is not lexed nor
+    parsed again. Programs without errors are compiled to code and run with
+    inputs as what cin reads, unless generate_code is False.
+    """
+
+    def __init__(
+        self,
+        source: str | LexerSession,
+        cache=None,
+        generate_code=True,
+        inputs=(),
+    ):
+        super().__init__()
+        self.source = source
+        self.cache = cache
+        self.generate_code = generate_code
+        self.inputs = inputs
+        self.signals = CompileSignals()
+        self.cancelled = False
+
+    def cancel(self):
+        """Stops the worker at its next check; it then emits nothing"""
+        self.cancelled = True
+
+    def check_cancelled(self):
+        if self.cancelled:
+            raise CompileCancelled()
+
+    def track(self, tokens):
+        """Yields the tokens to the parser, reporting progress on the way"""
+        total = max(len(tokens), 1)
+        for index, token in enumerate(tokens):
+            if index % CHECK_INTERVAL == 0:
+                self.check_cancelled()
+                self.signals.progress.emit(
+                    LEXER_PROGRESS + (100 - LEXER_PROGRESS) * index // total
+                )
+            yield token
+
+    def run(self):
+        # Imported with the first compile instead of with the editor
+        from intermediate_code import CodeGenerator
+        from optimizer import ConstantFolder
+        from semantic import SemanticAnalyzer
+        from virtual_machine import RUN_CHUNK, Bytecode, VirtualMachine
+
+        try:
+            # Cancelled while still queued in the pool: not even the cache
+            # is read
+            self.check_cancelled()
+            self.signals.progress.emit(0)
+            compiled = None
+            if self.cache is not None:
+                if isinstance(self.source, LexerSession):
+                    content = "\n".join(self.source.lines).encode()
+                else:
+                    content = self.source.encode()
+                compiled = self.cache.get(content)
+            if compiled is None:
+                compiled = self.parse()
+                self.check_cancelled()
+                if self.cache is not None:
+                    self.cache.put(content, compiled)
+
+            # Analyses of the AST are not cached: they are cheap next to
+            # lexing and parsing
+            tokens, lexical_errors, ast, syntax_errors, _ = compiled
+            analyzer = SemanticAnalyzer(ast)
+            symbols = analyzer.analyze()
+            self.check_cancelled()
+            intermediate_code = machine = folder = None
+            errors = lexical_errors or syntax_errors or analyzer.errors
+            if self.generate_code and not errors:
+                # The panels keep showing the tree as it was written
+                folder = ConstantFolder(ast)
+                optimized = folder.fold()
+                intermediate_code = CodeGenerator(optimized).generate()
+                self.check_cancelled()
+                bytecode = Bytecode.from_intermediate_code(intermediate_code)
+                machine = VirtualMachine(bytecode, self.inputs)
+                while machine.running:
+                    machine.run(RUN_CHUNK)
+                    self.check_cancelled()
+        except CompileCancelled:
+            return
+        except Exception as e:  # reported in the status bar instead of lost
+            if not self.cancelled:
+                self.signals.failed.emit(f"{type(e).__name__}: {e}")
+            return
+
+        self.signals.progress.emit(100)
+        self.signals.finished.emit(
+            CompileResult(
+                *compiled,
+                symbols=symbols,
+                semantic_errors=analyzer.errors,
+                intermediate_code=intermediate_code,
+                execution=machine,
+                optimization=folder,
+            )
+        )
+
+    def parse(self):
+        """Lexes and parses the source, as compile_text returns them"""
+        from parser_s import Parser
+
+        self.check_cancelled()
+        if isinstance(self.source, LexerSession):
+            tokens, lexical_errors = self.source.get_lexical_analysis()
+        else:
+            tokens, lexical_errors = get_lexical_analysis_from_text(self.source)
+        self.check_cancelled()
+        self.signals.progress.emit(LEXER_PROGRESS)
+
+        parser = Parser(self.track(tokens))
+        ast = parser.parse()
+        return tokens, lexical_errors, ast, parser.errors, parser.error_tokens
@@ -3,22 +3,62 @@ File that contains the dock panels of the application
 """
 
 from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QFont
 from PyQt5.QtWidgets import (
     QMainWindow,
     QTextBrowser,
     QDockWidget,
-    QTreeWidget,
-    QTreeWidgetItem,
+    QPlainTextEdit,
 )
 
+from lexer import TokenStore
 
-lexer = []  # List to store the widgets of the lexer dock panel
-syntactic = []  # List to store the widgets of the syntactic dock panel
+
+# Title of every panel, in the order of their tabs
+PANEL_TITLES = {
+    "lexer": "Lexico",
+    "syntactic": "Sintactico",
+    "semantic": "Semantico",
+    "hash_table": "Hash Table",
+    "intermediate_code": "Codigo Intermedio",
+    "results": "Resultados",
+    "lexer_errors": "Err. Lexicos",
+    "syntactic_errors": "Err. Sintacticos",
+    "semantic_errors": "Err. Semanticos",
+}
+
+panels = {}  # Dock panel of every key of PANEL_TITLES
+
+
+class LazyDockPanel(QDockWidget):
+    """
+    Dock panel whose widget is only built, by calling factory, the first time
+    the panel is shown or its widget is needed
+    """
+
+    def __init__(self, title: str, window: QMainWindow, factory):
+        super().__init__(title, window)
+        self.factory = factory
+        self.visibilityChanged.connect(self.handle_visibility_changed)
+
+    def content(self):
+        """This method returns the widget of the panel, building it if needed"""
+        widget = self.widget()
+        if widget is None:
+            widget = self.factory()
+            self.setWidget(widget)
+        return widget
+
+    def handle_visibility_changed(self, visible: bool):
+        """This method is called when the panel is shown or hidden"""
+        if visible:
+            self.content()
 
 
 def set_up_dock_panels(window: QMainWindow):
     """
-    Sets up the dock panels of the window
+    Sets up the dock panels of the window. Only the panels themselves are
+    created here; their widgets wait until they are shown.
 
     Args:
         window (QMainWindow): The window where the dock panels will be added
@@ -27,138 +67,106 @@ def set_up_dock_panels(window: QMainWindow):
         None
     """
 
-    # Panel for the Lexical Analysis
-    lexer_panel = QDockWidget("Lexico", window)
-    lexer_panel.setStyleSheet(open("./src/css/style.css", encoding="utf-8").read())
-    lexer_widget = QTextBrowser()
-    lexer_widget.setStyleSheet(open("./src/css/style.css", encoding="utf-8").read())
-    lexer.append(lexer_widget)
-    lexer_panel.setWidget(lexer_widget)
-    window.addDockWidget(Qt.BottomDockWidgetArea, lexer_panel)
-
-    # Panel for the Sintactic Analysis
-    sintactic_panel = QDockWidget("Sintactico", window)
-    sintactic_panel.setStyleSheet(open("./src/css/style.css", encoding="utf-8").read())
-    sintactic_widget = QTreeWidget()
-    sintactic_widget.setStyleSheet(open("./src/css/style.css", encoding="utf-8").read())
-    sintactic_widget.setHeaderHidden(True)
-    syntactic.append(sintactic_widget)
-    sintactic_panel.setWidget(sintactic_widget)
-    window.addDockWidget(Qt.BottomDockWidgetArea, sintactic_panel)
-
-    # Panel for the Semantic Analysis
-    semantic_panel = QDockWidget("Semantico", window)
-    semantic_panel.setStyleSheet(open("./src/css/style.css", encoding="utf-8").read())
-    semantic_widget = QTextBrowser()
-    semantic_widget.setStyleSheet(open("./src/css/style.css", encoding="utf-8").read())
-    semantic_panel.setWidget(semantic_widget)
-    window.addDockWidget(Qt.BottomDockWidgetArea, semantic_panel)
-
-    # Panel for the Hash Table
-    hash_table_panel = QDockWidget("Hash Table", window)
-    hash_table_panel.setStyleSheet(open("./src/css/style.css", encoding="utf-8").read())
-    hash_table_widget = QTextBrowser()
-    hash_table_widget.setStyleSheet(
-        open("./src/css/style.css", encoding="utf-8").read()
-    )
-    hash_table_panel.setWidget(hash_table_widget)
-    window.addDockWidget(Qt.BottomDockWidgetArea, hash_table_panel)
+    # The analysis widgets are imported with the first panel that needs them
+    def token_panel():
+        from components.token_view import TokenPanel
 
-    # Panel for the Intermediate Code
-    intermediate_code_panel = QDockWidget("Codigo Intermedio", window)
-    intermediate_code_panel.setStyleSheet(
-        open("./src/css/style.css", encoding="utf-8").read()
-    )
-    intermediate_code_widget = QTextBrowser()
-    intermediate_code_widget.setStyleSheet(
-        open("./src/css/style.css", encoding="utf-8").read()
-    )
-    intermediate_code_panel.setWidget(intermediate_code_widget)
-    window.addDockWidget(Qt.BottomDockWidgetArea, intermediate_code_panel)
-
-    # Panel for the Results
-    results_panel = QDockWidget("Resultados", window)
-    results_panel.setStyleSheet(open("./src/css/style.css", encoding="utf-8").read())
-    results_widget = QTextBrowser()
-    results_widget.setStyleSheet(open("./src/css/style.css", encoding="utf-8").read())
-    results_panel.setWidget(results_widget)
-    window.addDockWidget(Qt.BottomDockWidgetArea, results_panel)
-
-    # panel for the Lexical Errors
-    lexic_err_panel = QDockWidget("Err. Lexicos", window)
-    lexic_err_panel.setStyleSheet(open("./src/css/style.css", encoding="utf-8").read())
-    lexic_err_widget = QTextBrowser()
-    lexer.append(lexic_err_widget)
-    lexic_err_widget.setStyleSheet(open("./src/css/style.css", encoding="utf-8").read())
-    lexic_err_panel.setWidget(lexic_err_widget)
-    window.addDockWidget(Qt.BottomDockWidgetArea, lexic_err_panel)
-
-    # Panel for the Sintactic Errors
-    sintactic_err_panel = QDockWidget("Err. Sintacticos", window)
-    sintactic_err_panel.setStyleSheet(
-        open("./src/css/style.css", encoding="utf-8").read()
-    )
-    sintactic_err_widget = QTextBrowser()
-    syntactic.append(sintactic_err_widget)
-    sintactic_err_widget.setStyleSheet(
-        open("./src/css/style.css", encoding="utf-8").read()
-    )
-    sintactic_err_panel.setWidget(sintactic_err_widget)
-    window.addDockWidget(Qt.BottomDockWidgetArea, sintactic_err_panel)
+        panel = TokenPanel()
+        panel.tokenClicked.connect(window.go_to_position)
+        return panel
 
-    # Panel for the Semantic Errors
-    semantic_err_panel = QDockWidget("Err. Semanticos", window)
-    semantic_err_panel.setStyleSheet(
-        open("./src/css/style.css", encoding="utf-8").read()
-    )
-    semantic_err_widget = QTextBrowser()
-    semantic_err_widget.setStyleSheet(
-        open("./src/css/style.css", encoding="utf-8").read()
-    )
-    semantic_err_panel.setWidget(semantic_err_widget)
-    window.addDockWidget(Qt.BottomDockWidgetArea, semantic_err_panel)
-
-    window.tabifyDockWidget(lexer_panel, sintactic_panel)
-    window.tabifyDockWidget(sintactic_panel, semantic_panel)
-    window.tabifyDockWidget(semantic_panel, hash_table_panel)
-    window.tabifyDockWidget(hash_table_panel, intermediate_code_panel)
-    window.tabifyDockWidget(intermediate_code_panel, results_panel)
-    window.tabifyDockWidget(results_panel, lexic_err_panel)
-    window.tabifyDockWidget(lexic_err_panel, sintactic_err_panel)
-    window.tabifyDockWidget(sintactic_err_panel, semantic_err_panel)
+    def ast_view():
+        from components.ast_view import AstTreeView
+
+        return AstTreeView()
+
+    def typed_ast_view():
+        from components.ast_view import AstTreeView
+
+        return AstTreeView(show_types=True)
+
+    def results_panel():
+        from components.results_view import ResultsPanel
+
+        return ResultsPanel()
+
+    def plain_text():
+        # Monospaced and without rich text, so reports keep their columns
+        text = QPlainTextEdit()
+        text.setReadOnly(True)
+        text.setLineWrapMode(QPlainTextEdit.NoWrap)
+        text.setFont(QFont("Monospace", 12))
+        return text
+
+    factories = {
+        "lexer": token_panel,
+        "syntactic": ast_view,
+        "semantic": typed_ast_view,
+        "hash_table": plain_text,
+        "intermediate_code": plain_text,
+        "results": results_panel,
+        "lexer_errors": token_panel,
+    }
+
+    previous_panel = None
+    for key, title in PANEL_TITLES.items():
+        panel = LazyDockPanel(title, window, factories.get(key, QTextBrowser))
+        panels[key] = panel
+        window.addDockWidget(Qt.BottomDockWidgetArea, panel)
+        if previous_panel is not None:
+            window.tabifyDockWidget(previous_panel, panel)
+        previous_panel = panel
 
     # Allow the user to drag out the dock widgets
     window.setDockOptions(QMainWindow.AllowTabbedDocks | QMainWindow.AllowNestedDocks)
 
 
-def set_lexical_analysis_result(results: list[str]):
+def set_lexical_analysis_result(results: tuple[TokenStore, list]):
     """Set the results of the lexical analysis in the dock panel"""
-    tokens = ""
-    errors = ""
-    for element in results[0]:
-        tokens += f"{element}\n"
-    for element in results[1]:
-        errors += f"{element}\n"
-    lexer[0].setText(tokens)
-    lexer[1].setText(errors)
+    tokens, errors = results
+    if not isinstance(tokens, TokenStore):
+        tokens = TokenStore.from_tokens(tokens)
+    panels["lexer"].content().set_tokens(tokens)
+    panels["lexer_errors"].content().set_tokens(TokenStore.from_tokens(errors))
 
 
 def set_syntactic_analysis_result(ast, errors: list[str]):
     """Set the results of the sintactic analysis in the dock panel"""
-    syntactic[0].clear()
-    syntactic[1].clear()
-    root_item = QTreeWidgetItem(syntactic[0], [ast.value])
-    for child in ast.children:
-        add_tree_item(root_item, child)
-        syntactic[0].expandAll()
-    for error in errors:
-        errors_string = f"{error}\n"
-        syntactic[1].setText(errors_string)
-
-
-def add_tree_item(parent, node):
-    """Add a tree item to the tree widget"""
-    item = QTreeWidgetItem(parent, [node.value])
-    for child in node.children:
-        add_tree_item(item, child)
-    return item
+    panels["syntactic"].content().set_ast(ast)
+    panels["syntactic_errors"].content().setPlainText(
+        "".join(f"{error}\n" for error in errors)
+    )
+
+
+def set_semantic_analysis_result(ast, errors: list[str]):
+    """Set the annotated AST and the semantic errors in the dock panels"""
+    panels["semantic"].content().set_ast(ast)
+    panels["semantic_errors"].content().setPlainText(
+        "".join(f"{error}\n" for error in errors)
+    )
+
+
+def set_hash_table_result(symbols):
+    """Set the symbol table of the program in the dock panel"""
+    panels["hash_table"].content().setPlainText(symbols.report())
+
+
+def set_intermediate_code_result(code, optimization=None):
+    """Set the intermediate code of the program in the dock panel"""
+    if code is None:
+        text = "The program has errors"
+    elif optimization is not None:
+        text = f"{optimization.summary()}\n{code.render()}"
+    else:
+        text = code.render()
+    panels["intermediate_code"].content().setPlainText(text)
+
+
+def get_program_inputs() -> list[str]:
+    """Values typed in the results panel for the program to read"""
+    return panels["results"].content().inputs()
+
+
+def set_execution_result(machine):
+    """Set the report of running the program in the dock panel"""
+    panels["results"].content().set_execution(machine)
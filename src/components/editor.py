@@ -1,12 +1,21 @@
 """This module contains the Editor class that will be used to write the code"""
 
 import builtins
-import re
+from itertools import accumulate
 import types
 from PyQt5.QtGui import QFont, QColor
-from PyQt5.QtCore import pyqtSignal
+from PyQt5.QtCore import QThreadPool, QTimer, pyqtSignal
 from PyQt5.Qsci import QsciScintilla, QsciLexerCustom
 
+from lexer import NUMBER_KINDS, LexerSession, TokenKind
+from components.compile_worker import CompileResult, CompileWorker
+
+
+LIVE_ANALYSIS_DELAY = 300  # ms without typing before the live analysis runs
+ERROR_INDICATOR = 8  # first indicator Scintilla leaves to applications
+ERROR_MARKER = 1
+ERROR_MARGIN = 1
+
 
 class Editor(QsciScintilla):
     """This class is the editor widget that will be used to write the code"""
@@ -18,6 +27,19 @@ class Editor(QsciScintilla):
 
         self.cursorPositionChanged.connect(self.handle_cursor_position_changed)
 
+        # Tokens of the document, kept up to date line by line on every edit
+        self.lexer_session = LexerSession()
+        self.SCN_MODIFIED.connect(self.handle_modified)
+
+        # Live analysis: lex and parse in the background once typing pauses
+        self.live_analysis = True
+        self.live_worker = None
+        self.live_timer = QTimer(self)
+        self.live_timer.setSingleShot(True)
+        self.live_timer.setInterval(LIVE_ANALYSIS_DELAY)
+        self.live_timer.timeout.connect(self.start_live_analysis)
+        self.textChanged.connect(self.schedule_live_analysis)
+
         # Encoding
         self.setUtf8(True)
 
@@ -59,10 +81,117 @@ class Editor(QsciScintilla):
         self.setMarginsBackgroundColor(QColor("#282c34"))
         self.setMarginsFont(self.window_font)
 
+        # Diagnostics: squiggles under the errors and a marker on their lines
+        self.indicatorDefine(QsciScintilla.SquiggleIndicator, ERROR_INDICATOR)
+        self.setIndicatorForegroundColor(QColor("#ff5555"), ERROR_INDICATOR)
+        self.setMarginType(ERROR_MARGIN, QsciScintilla.SymbolMargin)
+        self.setMarginWidth(ERROR_MARGIN, 14)
+        self.setMarginMarkerMask(ERROR_MARGIN, 1 << ERROR_MARKER)
+        self.markerDefine(QsciScintilla.Circle, ERROR_MARKER)
+        self.setMarkerBackgroundColor(QColor("#ff5555"), ERROR_MARKER)
+        self.setMarkerForegroundColor(QColor("#ff5555"), ERROR_MARKER)
+
     def handle_cursor_position_changed(self, line, index):
         """This method is called every time the cursor position changes"""
         self.cursorPositionChangedSignal.emit(line, index)
 
+    def handle_modified(
+        self, position, modification_type, _text, _length, lines_added, *_
+    ):
+        """This method is called by Scintilla after text is inserted or deleted"""
+        if modification_type & self.SC_MOD_INSERTTEXT:
+            replaced_lines = 1
+            new_lines = lines_added + 1
+        elif modification_type & self.SC_MOD_DELETETEXT:
+            replaced_lines = 1 - lines_added
+            new_lines = 1
+        else:
+            return
+
+        first_line = self.SendScintilla(self.SCI_LINEFROMPOSITION, position)
+        self.lexer_session.replace_lines(
+            first_line,
+            replaced_lines,
+            [self.text(line) for line in range(first_line, first_line + new_lines)],
+        )
+
+    def set_live_analysis(self, enabled: bool):
+        """Turns the live analysis on or off"""
+        self.live_analysis = enabled
+        if enabled:
+            self.schedule_live_analysis()
+        else:
+            self.live_timer.stop()
+            if self.live_worker is not None:
+                self.live_worker.cancel()
+                self.live_worker = None
+            self.clear_diagnostics()
+
+    def schedule_live_analysis(self):
+        """Restarts the countdown to the next live analysis"""
+        if self.live_analysis:
+            self.live_timer.start()
+
+    def start_live_analysis(self):
+        """Analyzes a snapshot of the document in the background"""
+        # Only the newest text matters, so a run still going is abandoned
+        if self.live_worker is not None:
+            self.live_worker.cancel()
+        # Only the errors are shown, so no code is generated
+        worker = CompileWorker(self.lexer_session.snapshot(), generate_code=False)
+        worker.signals.finished.connect(self.show_diagnostics)
+        worker.signals.failed.connect(self.discard_diagnostics)
+        self.live_worker = worker
+        QThreadPool.globalInstance().start(worker)
+
+    def show_diagnostics(self, result: CompileResult):
+        """Marks the errors of a finished live analysis in the editor"""
+        if self.live_worker is None or self.sender() is not self.live_worker.signals:
+            return
+        self.live_worker = None
+        # The text changed after the snapshot was taken; a newer run is due
+        if self.live_timer.isActive():
+            return
+
+        self.clear_diagnostics()
+        for token in list(result.lexical_errors) + result.error_tokens:
+            self.mark_error(token)
+
+    def discard_diagnostics(self, message: str):
+        """Removes the error marks once a live analysis fails, as they are stale"""
+        if self.live_worker is None or self.sender() is not self.live_worker.signals:
+            return
+        self.live_worker = None
+        if self.live_timer.isActive():
+            return
+
+        self.clear_diagnostics()
+
+    def mark_error(self, token):
+        """Underlines the token where an error was found and marks its line"""
+        if token is None:  # the input ended too early
+            line = max(self.lines() - 1, 0)
+            index = max(len(self.text(line)) - 1, 0)
+            length = 1
+        else:
+            line = token.lineno - 1
+            index = token.lexpos - 1
+            if token.kind == TokenKind.ERROR:
+                # A stray character, or the "/*" of an unclosed block comment
+                length = 1 if token.value.startswith("Invalid character") else 2
+            else:
+                length = len(str(token.value))
+        self.fillIndicatorRange(line, index, line, index + length, ERROR_INDICATOR)
+        self.markerAdd(line, ERROR_MARKER)
+
+    def clear_diagnostics(self):
+        """Removes every error mark from the editor"""
+        last_line = max(self.lines() - 1, 0)
+        self.clearIndicatorRange(
+            0, 0, last_line, len(self.text(last_line)), ERROR_INDICATOR
+        )
+        self.markerDeleteAll(ERROR_MARKER)
+
     def handle_text_changed(self):
         """This method is called every time the content of the editor changes"""
         line, index = self.getCursorPosition()
@@ -129,6 +258,22 @@ class CustomLexer(QsciLexerCustom):
         self.setFont(QFont("Monospace", 12), self.RELATIONAL_OPERATOR)
         self.setFont(QFont("Monospace", 12), self.LOGICAL_OPERATOR)
 
+        # Style of every token kind of the compiler lexer
+        self.kind_styles = [self.DEFAULT] * len(TokenKind)
+        for kind in TokenKind:
+            if kind <= TokenKind.FLOAT:
+                self.kind_styles[kind] = self.KEYWORD
+            elif kind in (TokenKind.AND, TokenKind.OR):
+                self.kind_styles[kind] = self.LOGICAL_OPERATOR
+            elif kind == TokenKind.IDENTIFIER:
+                self.kind_styles[kind] = self.IDENTIFIER
+            elif kind in NUMBER_KINDS:
+                self.kind_styles[kind] = self.NUMBER
+            elif TokenKind.INCREMENT_OPERATOR <= kind <= TokenKind.POW:
+                self.kind_styles[kind] = self.ARITHMETIC_OPERATOR
+            elif TokenKind.EQ <= kind <= TokenKind.NE:
+                self.kind_styles[kind] = self.RELATIONAL_OPERATOR
+
     def language(self):
         return "CustomLexer"
 
@@ -153,56 +298,84 @@ class CustomLexer(QsciLexerCustom):
             return ""
 
     def styleText(self, start, end):
-        ############################## Patterns ##############################
-        identifier_pattern = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
-        reserved_words_pattern = re.compile(
-            r"\b(if|else|do|while|switch|case|double|main|cin|cout|int|float)\b"
-        )
-        number_pattern = re.compile(r"\b\d+\b")
-        aritmethic_op_pattern = re.compile(r"\+|-|\*|/|%|\^")
-        relational_op_pattern = re.compile(r"<|>|!|=")
-        logical_op_pattern = re.compile(r"\b(?:and|or)\b")
-        p = re.compile(r"//.*?$|/\*|\*/|\b\w+\b|\W", re.MULTILINE)
-        ######################################################################
-
-        # Called everytime the editors text has changed
-        self.startStyling(start)
-        editor: QsciScintilla = self.parent()
-
-        text = editor.text()[start:end]
-
-        token_list = [
-            (token, len(bytearray(token, "utf-8"))) for token in p.findall(text)
-        ]
+        # Called by Scintilla with the range that needs styling, widened here
+        # to whole lines, whose UTF-8 bytes are read with SCI_GETTEXTRANGE.
+        # The tokens come from the editor's LexerSession, so the highlighter
+        # sees exactly what the compiler will; the gaps between them are
+        # comments or blanks.
+        #
+        # Only SCN_MODIFIED updates the session. When Scintilla asks for
+        # styling before an edit has reached it, styling stops at the first
+        # line the session does not hold yet; Scintilla asks for the rest
+        # again once the edit is in.
+        editor: Editor = self.parent()
+        session = editor.lexer_session
+        first_line = editor.SendScintilla(editor.SCI_LINEFROMPOSITION, start)
+        last_line = editor.SendScintilla(editor.SCI_LINEFROMPOSITION, end)
+        if last_line + 1 < editor.lines():
+            end = editor.SendScintilla(editor.SCI_POSITIONFROMLINE, last_line + 1)
+        else:
+            end = editor.SendScintilla(editor.SCI_GETLENGTH)
+        start = editor.SendScintilla(editor.SCI_POSITIONFROMLINE, first_line)
+
+        text = bytearray(end - start + 1)  # room for the closing NUL
+        editor.SendScintilla(editor.SCI_GETTEXTRANGE, start, end, text)
+        del text[-1]
+
+        lines = []  # (text, its UTF-8 bytes, line terminator bytes)
+        for line, line_bytes in enumerate(bytes(text).splitlines(True), first_line):
+            content = line_bytes.rstrip(b"\r\n")
+            line_text = content.decode("utf-8", "replace")
+            if line >= len(session.lines) or session.lines[line] != line_text:
+                break
+            lines.append((line_text, content, len(line_bytes) - len(content)))
+        if not lines:
+            return
+        last_line = first_line + len(lines) - 1
 
-        is_multiline_comment = False
-
-        if start > 0:
-            previous_style_nr = editor.SendScintilla(editor.SCI_GETSTYLEAT, start - 1)
-            if previous_style_nr == self.COMMENT:
-                is_multiline_comment = True
-
-        for token in token_list:
-            if is_multiline_comment:
-                self.setStyling(token[1], self.COMMENT)
-                if token[0] == "*/":
-                    is_multiline_comment = False
-            elif token[0].startswith("//"):
-                self.setStyling(token[1], self.COMMENT)
-            elif reserved_words_pattern.match(token[0]):
-                self.setStyling(token[1], self.KEYWORD)
-            elif logical_op_pattern.match(token[0]):
-                self.setStyling(token[1], self.LOGICAL_OPERATOR)
-            elif identifier_pattern.match(token[0]):
-                self.setStyling(token[1], self.IDENTIFIER)
-            elif number_pattern.match(token[0]) or token[0] == ".":
-                self.setStyling(token[1], self.NUMBER)
-            elif token[0] == "/*":
-                is_multiline_comment = True
-                self.setStyling(token[1], self.COMMENT)
-            elif aritmethic_op_pattern.match(token[0]):
-                self.setStyling(token[1], self.ARITHMETIC_OPERATOR)
-            elif relational_op_pattern.match(token[0]):
-                self.setStyling(token[1], self.RELATIONAL_OPERATOR)
+        self.startStyling(start)
+        styling = []  # (style, length in bytes) from start on
+        tokens = session.highlight_tokens(first_line, last_line)
+        token = next(tokens, None)
+        for line, (text, content, terminator) in enumerate(lines, first_line):
+            # Scintilla counts UTF-8 bytes, the lexer counts characters
+            if content.isascii():
+                offsets = range(len(text) + 1)
             else:
-                self.setStyling(token[1], self.DEFAULT)
+                offsets = list(accumulate((len(c.encode()) for c in text), initial=0))
+
+            position = 0
+            while token is not None and token[0] == line:
+                _, kind, lexpos, length = token
+                token_start = lexpos - 1
+                if token_start > position:
+                    styling.append(
+                        self.gap_styling(text, offsets, position, token_start)
+                    )
+                position = token_start + length
+                styling.append(
+                    (self.kind_styles[kind], offsets[position] - offsets[token_start])
+                )
+                token = next(tokens, None)
+            if position < len(text):
+                styling.append(self.gap_styling(text, offsets, position, len(text)))
+            styling.append((self.DEFAULT, terminator))
+
+        # Runs of one style are set at once
+        run_style = self.DEFAULT
+        run_length = 0
+        for style, length in styling:
+            if style != run_style:
+                if run_length:
+                    self.setStyling(run_length, run_style)
+                run_style = style
+                run_length = 0
+            run_length += length
+        if run_length:
+            self.setStyling(run_length, run_style)
+
+    def gap_styling(self, text: str, offsets, gap_start: int, gap_end: int):
+        """Style and length in bytes of the text between two tokens: anything
+        but blanks there is a comment"""
+        style = self.COMMENT if text[gap_start:gap_end].strip() else self.DEFAULT
+        return style, offsets[gap_end] - offsets[gap_start]
@@ -79,6 +79,12 @@ def set_up_run_menu_actions(window: QMainWindow, run_menu: QMenu):
     compile_start.setShortcut("Ctrl+R")
     compile_start.triggered.connect(window.compile)
 
+    # Live Analysis
+    live_analysis = run_menu.addAction("Live Analysis")
+    live_analysis.setCheckable(True)
+    live_analysis.setChecked(window.live_analysis)
+    live_analysis.toggled.connect(window.set_live_analysis)
+
 
 def set_up_icons_for_menu(window: QMainWindow, menu_bar):
     """
@@ -126,7 +132,6 @@ def set_up_menu(window: QMainWindow):
     Returns: None
     """
     menu_bar = window.menuBar()  # Get the menu bar of the window
-    menu_bar.setStyleSheet(open("./src/css/style.css", encoding="utf-8").read())
 
     # File Menu
     set_up_file_menu_actions(window, menu_bar.addMenu("File"))
@@ -0,0 +1,38 @@
+"""
+This module contains the panel that runs the compiled program: a line for
+the values read by cin and the report of the run
+"""
+
+from PyQt5.QtGui import QFont
+from PyQt5.QtWidgets import QLineEdit, QPlainTextEdit, QVBoxLayout, QWidget
+
+
+class ResultsPanel(QWidget):
+    """Input given to the next run above the output of the last one"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.input_edit = QLineEdit()
+        self.input_edit.setPlaceholderText("Values for cin, separated by spaces")
+
+        self.output = QPlainTextEdit()
+        self.output.setReadOnly(True)
+        self.output.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.output.setFont(QFont("Monospace", 12))
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+        layout.addWidget(self.input_edit)
+        layout.addWidget(self.output)
+        self.setLayout(layout)
+
+    def inputs(self) -> list[str]:
+        """This method returns the values typed for cin, in order"""
+        return self.input_edit.text().split()
+
+    def set_execution(self, machine):
+        """This method shows the report of a run, or why there was none"""
+        self.output.setPlainText(
+            machine.report() if machine is not None else "The program has errors"
+        )
@@ -0,0 +1,51 @@
+"""
+This module contains the timer behind the startup measurement modes
+"""
+
+import sys
+
+from PyQt5.QtCore import QEvent, QObject, QTimer
+from PyQt5.QtWidgets import QApplication, QWidget
+
+from startup_profile import StartupProfile
+
+
+class StartupTimer(QObject):
+    """
+    Waits for the first paint of a window, prints the startup time, or every
+    phase of it, and quits the application. The exit status is 1 when the
+    time is over the budget, in milliseconds.
+    """
+
+    def __init__(
+        self,
+        profile: StartupProfile,
+        show_phases: bool = False,
+        budget: float | None = None,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.profile = profile
+        self.show_phases = show_phases
+        self.budget = budget
+
+    def watch(self, window: QWidget):
+        """This method starts waiting for the first paint of window"""
+        window.installEventFilter(self)
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Paint:
+            watched.removeEventFilter(self)
+            self.profile.mark("first paint")
+            elapsed = self.profile.elapsed() * 1000
+            if self.show_phases:
+                print(self.profile.report(), file=sys.stderr)
+            print(f"Time to first paint: {elapsed:.1f} ms", file=sys.stderr)
+
+            status = 0
+            if self.budget is not None and elapsed > self.budget:
+                print(f"Over the budget of {self.budget:.1f} ms", file=sys.stderr)
+                status = 1
+            # Let the paint finish before quitting
+            QTimer.singleShot(0, lambda: QApplication.instance().exit(status))
+        return False
@@ -0,0 +1,199 @@
+"""
+This module contains the table that lists tokens or lexical errors in the
+lexical panels
+"""
+
+from array import array
+
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt, pyqtSignal
+from PyQt5.QtWidgets import (
+    QAbstractItemView,
+    QHeaderView,
+    QLineEdit,
+    QTableView,
+    QVBoxLayout,
+    QWidget,
+)
+
+from lexer import TokenKind, TokenStore
+
+
+COLUMNS = ("Type", "Value", "Line", "Column")
+TYPE_COLUMN, VALUE_COLUMN, LINE_COLUMN, COLUMN_COLUMN = range(len(COLUMNS))
+
+_KIND_NAMES = [kind.name for kind in TokenKind]
+
+
+class TokenTableModel(QAbstractTableModel):
+    """
+    Table model read straight from the arrays of a TokenStore. Sorting and
+    filtering only rearrange an array of row numbers, so setting the tokens
+    costs the same however many there are.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.tokens = TokenStore()
+        # Token shown in every row, None while that is all of them in order
+        self.rows = None
+        self.filter_text = ""
+        self.sort_column = None
+        self.sort_order = Qt.AscendingOrder
+
+    def set_tokens(self, tokens: TokenStore):
+        """This method replaces the tokens shown by the model"""
+        self.beginResetModel()
+        self.tokens = tokens
+        self.rows = self.arrange()
+        self.endResetModel()
+
+    def set_filter(self, text: str):
+        """This method keeps only the tokens whose type or value contain text"""
+        self.beginResetModel()
+        self.filter_text = text
+        self.rows = self.arrange()
+        self.endResetModel()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.layoutAboutToBeChanged.emit()
+        # A negative column, from sortByColumn(-1), restores document order
+        self.sort_column = column if column >= 0 else None
+        self.sort_order = order
+        self.rows = self.arrange()
+        self.layoutChanged.emit()
+
+    def arrange(self):
+        """Row numbers matching the filter, in the sort order"""
+        tokens = self.tokens
+        text = self.filter_text.lower()
+        if text:
+            kinds = {
+                kind for kind, name in enumerate(_KIND_NAMES) if text in name.lower()
+            }
+            values = {
+                index
+                for index, value in enumerate(tokens.pool)
+                if text in str(value).lower()
+            }
+            rows = [
+                row
+                for row, (kind, value) in enumerate(zip(tokens.kinds, tokens.values))
+                if kind in kinds or value in values
+            ]
+        elif self.sort_column is not None:
+            rows = range(len(tokens))
+        else:
+            return None
+
+        if self.sort_column is not None:
+            rows = sorted(
+                rows,
+                key=self.sort_key(self.sort_column),
+                reverse=self.sort_order == Qt.DescendingOrder,
+            )
+        return array("i", rows)
+
+    def sort_key(self, column: int):
+        tokens = self.tokens
+        if column == TYPE_COLUMN:
+            ranks = _ranks(_KIND_NAMES)
+            return lambda row: ranks[tokens.kinds[row]]
+        if column == VALUE_COLUMN:
+            ranks = _ranks([str(value) for value in tokens.pool])
+            return lambda row: ranks[tokens.values[row]]
+        if column == LINE_COLUMN:
+            return tokens.linenos.__getitem__
+        return tokens.lexposes.__getitem__
+
+    def token_row(self, row: int) -> int:
+        """Index in the TokenStore of the token shown in a row"""
+        return row if self.rows is None else self.rows[row]
+
+    def position(self, index: QModelIndex) -> tuple[int, int]:
+        """Line and column of the token in a row"""
+        row = self.token_row(index.row())
+        return self.tokens.linenos[row], self.tokens.lexposes[row]
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.tokens) if self.rows is None else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            row = self.token_row(index.row())
+            column = index.column()
+            if column == TYPE_COLUMN:
+                return _KIND_NAMES[self.tokens.kinds[row]]
+            if column == VALUE_COLUMN:
+                return str(self.tokens.value(row))
+            if column == LINE_COLUMN:
+                return self.tokens.linenos[row]
+            return self.tokens.lexposes[row]
+        if role == Qt.TextAlignmentRole and index.column() >= LINE_COLUMN:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return COLUMNS[section]
+        return None
+
+
+def _ranks(values: list[str]) -> list[int]:
+    """Position of every value when they are sorted"""
+    ranks = [0] * len(values)
+    for rank, index in enumerate(sorted(range(len(values)), key=values.__getitem__)):
+        ranks[index] = rank
+    return ranks
+
+
+class TokenPanel(QWidget):
+    """
+    Filter box over a sortable table of tokens. Clicking a row emits the
+    line and column of its token.
+    """
+
+    tokenClicked = pyqtSignal(int, int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.model = TokenTableModel(self)
+
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter by type or value")
+        self.filter_edit.textChanged.connect(self.model.set_filter)
+
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSortingEnabled(True)
+        self.table.sortByColumn(-1, Qt.AscendingOrder)  # document order
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setWordWrap(False)
+        # Every row has the same fixed height, so the view never measures the
+        # rows it does not show
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().hide()
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.clicked.connect(self.handle_clicked)
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+        layout.addWidget(self.filter_edit)
+        layout.addWidget(self.table)
+        self.setLayout(layout)
+
+    def set_tokens(self, tokens: TokenStore):
+        """This method shows a new list of tokens"""
+        self.model.set_tokens(tokens)
+
+    def handle_clicked(self, index: QModelIndex):
+        """This method is called when a row of the table is clicked"""
+        self.tokenClicked.emit(*self.model.position(index))
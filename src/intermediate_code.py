@@ -0,0 +1,325 @@
+"""
+    Three-address intermediate code. Instructions are quadruples (opcode,
+    result, first argument, second argument) kept in four array("i")
+    columns, so a program of millions of instructions takes four machine
+    ints each and pickles as four flat buffers.
+
+    An operand is one int: a number shifted left by two, ORed with its kind.
+    The number of a variable or constant is its index in a pool of names;
+    temporaries and labels are just numbered. NO_OPERAND fills the unused
+    places of an instruction. The declared type of every variable is kept
+    next to its name, for the machine that runs the code.
+"""
+
+from array import array
+from enum import IntEnum
+
+from parser_s import Node
+
+
+class Opcode(IntEnum):
+    COPY = 0  # result = arg1
+    PLUS = 1  # result = arg1 + arg2, and so on for every binary operator
+    MINUS = 2
+    TIMES = 3
+    DIVIDE = 4
+    MOD = 5
+    POW = 6
+    LT = 7
+    LE = 8
+    GT = 9
+    GE = 10
+    EQ = 11
+    NE = 12
+    # 13 and 14 were AND and OR, which are lowered to jumps instead
+    LABEL = 15  # result:
+    GOTO = 16  # goto result
+    IF_FALSE = 17  # ifFalse arg1 goto result
+    IF_TRUE = 18  # if arg1 goto result
+    READ = 19  # read result
+    WRITE = 20  # write arg1
+
+
+class OperandKind(IntEnum):
+    VARIABLE = 0
+    CONSTANT = 1
+    TEMPORARY = 2
+    LABEL = 3
+
+
+NO_OPERAND = -1
+
+# Opcode of every binary operator node of the AST
+BINARY_OPCODES = {
+    name: Opcode[name]
+    for name in (
+        "PLUS",
+        "MINUS",
+        "TIMES",
+        "DIVIDE",
+        "MOD",
+        "POW",
+        "LT",
+        "LE",
+        "GT",
+        "GE",
+        "EQ",
+        "NE",
+    )
+}
+# Logical operators evaluate their right operand only when the left one does
+# not decide the result, so they jump past it: to the end on a false left
+# operand of and, on a true one of or
+SHORT_CIRCUIT_OPCODES = {"AND": Opcode.IF_FALSE, "OR": Opcode.IF_TRUE}
+
+OPERATOR_SYMBOLS = {
+    Opcode.PLUS: "+",
+    Opcode.MINUS: "-",
+    Opcode.TIMES: "*",
+    Opcode.DIVIDE: "/",
+    Opcode.MOD: "%",
+    Opcode.POW: "^",
+    Opcode.LT: "<",
+    Opcode.LE: "<=",
+    Opcode.GT: ">",
+    Opcode.GE: ">=",
+    Opcode.EQ: "==",
+    Opcode.NE: "!=",
+}
+
+# Instructions shown in the panel; the rest are only counted
+RENDER_LIMIT = 100_000
+
+
+class IntermediateCode:
+    """The instructions of a program and the names their operands refer to."""
+
+    __slots__ = (
+        "opcodes",
+        "results",
+        "args1",
+        "args2",
+        "names",
+        "types",
+        "temporaries",
+        "labels",
+    )
+
+    def __init__(self):
+        self.opcodes = array("i")
+        self.results = array("i")
+        self.args1 = array("i")
+        self.args2 = array("i")
+        self.names = []  # of variables and constants
+        self.types = []  # declared type of every name, None for constants
+        self.temporaries = 0
+        self.labels = 0
+
+    def __len__(self):
+        return len(self.opcodes)
+
+    def emit(self, opcode, result=NO_OPERAND, arg1=NO_OPERAND, arg2=NO_OPERAND):
+        self.opcodes.append(opcode)
+        self.results.append(result)
+        self.args1.append(arg1)
+        self.args2.append(arg2)
+
+    def operand_text(self, operand: int) -> str:
+        kind = operand & 3
+        number = operand >> 2
+        if kind == OperandKind.TEMPORARY:
+            return f"$t{number}"  # "$" keeps it apart from variable names
+        if kind == OperandKind.LABEL:
+            return f"L{number}"
+        return self.names[number]
+
+    def instruction_text(self, index: int) -> str:
+        opcode = self.opcodes[index]
+        text = self.operand_text
+        result, arg1, arg2 = self.results[index], self.args1[index], self.args2[index]
+        if opcode == Opcode.COPY:
+            return f"{text(result)} = {text(arg1)}"
+        if opcode in OPERATOR_SYMBOLS:
+            return (
+                f"{text(result)} = {text(arg1)} {OPERATOR_SYMBOLS[opcode]} "
+                f"{text(arg2)}"
+            )
+        if opcode == Opcode.LABEL:
+            return f"{text(result)}:"
+        if opcode == Opcode.GOTO:
+            return f"goto {text(result)}"
+        if opcode == Opcode.IF_FALSE:
+            return f"ifFalse {text(arg1)} goto {text(result)}"
+        if opcode == Opcode.IF_TRUE:
+            return f"if {text(arg1)} goto {text(result)}"
+        if opcode == Opcode.READ:
+            return f"read {text(result)}"
+        return f"write {text(arg1)}"
+
+    def render(self, limit: int = RENDER_LIMIT) -> str:
+        """Listing of the instructions, as shown in the Codigo Intermedio panel."""
+        lines = [
+            f"{len(self)} instructions, {self.temporaries} temporaries, "
+            f"{self.labels} labels",
+            "",
+        ]
+        for index in range(min(len(self), limit)):
+            if self.opcodes[index] == Opcode.LABEL:
+                lines.append(self.instruction_text(index))
+            else:
+                lines.append(f"{index:>8}    {self.instruction_text(index)}")
+        if len(self) > limit:
+            lines.append(f"... {len(self) - limit} more instructions")
+        return "\n".join(lines)
+
+
+# Steps of the lowering, pushed on its stack along with their argument
+_LOWER, _BINARY, _COPY, _WRITE, _BRANCH, _GOTO, _LABEL, _VALUE = range(8)
+
+
+class CodeGenerator:
+    """
+    Lowers an AST without errors into IntermediateCode. The walk uses an
+    explicit stack of steps, so neither long programs nor deeply nested
+    expressions reach the recursion limit.
+    """
+
+    def __init__(self, ast: Node | None):
+        self.ast = ast
+        self.code = IntermediateCode()
+        self.name_operands = {}  # (kind, name) -> operand
+
+    def name_operand(self, kind: OperandKind, name: str) -> int:
+        key = (kind, name)
+        operand = self.name_operands.get(key)
+        if operand is None:
+            operand = (len(self.code.names) << 2) | kind
+            self.code.names.append(name)
+            self.code.types.append(None)
+            self.name_operands[key] = operand
+        return operand
+
+    def variable(self, node: Node) -> int:
+        """Operand of the variable a node names, which gives it its type"""
+        operand = self.name_operand(OperandKind.VARIABLE, node.value)
+        if node.type is not None:
+            self.code.types[operand >> 2] = node.type
+        return operand
+
+    def new_temporary(self) -> int:
+        self.code.temporaries += 1
+        return (self.code.temporaries << 2) | OperandKind.TEMPORARY
+
+    def new_label(self) -> int:
+        self.code.labels += 1
+        return (self.code.labels << 2) | OperandKind.LABEL
+
+    def generate(self) -> IntermediateCode:
+        code = self.code
+        emit = code.emit
+        stack = [(_LOWER, self.ast)] if self.ast is not None else []
+        values = []  # operand holding the value of every expression lowered
+        while stack:
+            step, item = stack.pop()
+            if step == _BINARY:
+                right = values.pop()
+                left = values.pop()
+                result = self.new_temporary()
+                emit(item, result, left, right)
+                values.append(result)
+            elif step == _COPY:
+                emit(Opcode.COPY, item, values.pop())
+            elif step == _WRITE:
+                emit(Opcode.WRITE, NO_OPERAND, values.pop())
+            elif step == _BRANCH:
+                opcode, label = item
+                emit(opcode, label, values.pop())
+            elif step == _GOTO:
+                emit(Opcode.GOTO, item)
+            elif step == _LABEL:
+                emit(Opcode.LABEL, item)
+            elif step == _VALUE:
+                values.append(item)
+            else:
+                self.lower(item, stack, values)
+        return code
+
+    def lower(self, node: Node, stack: list, values: list):
+        """Emits the code of a node, or pushes the steps that will."""
+        name = node.name
+        children = node.children
+        if name == "Number":
+            values.append(self.name_operand(OperandKind.CONSTANT, node.value))
+        elif name == "Identifier":
+            values.append(self.variable(node))
+        elif name in BINARY_OPCODES:
+            stack.append((_BINARY, BINARY_OPCODES[name]))
+            stack.append((_LOWER, children[1]))
+            stack.append((_LOWER, children[0]))
+        elif name in SHORT_CIRCUIT_OPCODES:
+            # t = left; ifFalse t goto end (if t, for or); t = right; end:
+            result, end = self.new_temporary(), self.new_label()
+            steps = [
+                (_LOWER, children[0]),
+                (_COPY, result),
+                (_VALUE, result),
+                (_BRANCH, (SHORT_CIRCUIT_OPCODES[name], end)),
+                (_LOWER, children[1]),
+                (_COPY, result),
+                (_LABEL, end),
+                (_VALUE, result),
+            ]
+            stack.extend(reversed(steps))
+        elif name == "Assignment":
+            target, value = children
+            if value.name != "EmptyStatement":
+                stack.append((_COPY, self.variable(target)))
+                stack.append((_LOWER, value))
+        elif name == "DECLARATION" or name == "INITIALIZATION":
+            if children:
+                stack.append((_COPY, self.variable(node)))
+                stack.append((_LOWER, children[0]))
+        elif name == "Increment" or name == "Decrement":
+            target = self.variable(children[0])
+            one = self.name_operand(OperandKind.CONSTANT, "1")
+            opcode = Opcode.PLUS if name == "Increment" else Opcode.MINUS
+            self.code.emit(opcode, target, target, one)
+        elif name == "Input":
+            self.code.emit(Opcode.READ, self.variable(children[0]))
+        elif name == "Output":
+            stack.append((_WRITE, None))
+            stack.append((_LOWER, children[0]))
+        elif name == "If":
+            # cond; ifFalse cond goto else; true; goto end; else: false; end:
+            end = self.new_label()
+            steps = [(_LOWER, children[0])]
+            if len(children) == 3:
+                otherwise = self.new_label()
+                steps.append((_BRANCH, (Opcode.IF_FALSE, otherwise)))
+                steps.append((_LOWER, children[1]))
+                steps.append((_GOTO, end))
+                steps.append((_LABEL, otherwise))
+                steps.append((_LOWER, children[2]))
+            else:
+                steps.append((_BRANCH, (Opcode.IF_FALSE, end)))
+                steps.append((_LOWER, children[1]))
+            steps.append((_LABEL, end))
+            stack.extend(reversed(steps))
+        elif name == "While":
+            # start: cond; ifFalse cond goto end; body; goto start; end:
+            start, end = self.new_label(), self.new_label()
+            stack.append((_LABEL, end))
+            stack.append((_GOTO, start))
+            stack.extend((_LOWER, child) for child in reversed(children[1:]))
+            stack.append((_BRANCH, (Opcode.IF_FALSE, end)))
+            stack.append((_LOWER, children[0]))
+            stack.append((_LABEL, start))
+        elif name == "DoWhile":
+            # start: body; cond; if cond goto start
+            start = self.new_label()
+            stack.append((_BRANCH, (Opcode.IF_TRUE, start)))
+            stack.append((_LOWER, children[-1]))
+            stack.extend((_LOWER, child) for child in reversed(children[:-1]))
+            stack.append((_LABEL, start))
+        else:  # Program, VariableDeclaration and the branches of an If
+            stack.extend((_LOWER, child) for child in reversed(children))
@@ -0,0 +1,279 @@
+"""
+    LL(1) parser generator. Reads a grammar file such as grammar.txt, computes
+    the FIRST and FOLLOW sets of its nonterminals, checks that every table
+    cell has at most one production and writes the parse table as a Python
+    module that table_parser.TableParser loads.
+
+    Usage: python src/ll1.py GRAMMAR [-o OUTPUT]
+"""
+
+from pathlib import Path
+import argparse
+import sys
+import textwrap
+
+from lexer import TokenKind
+
+
+EMPTY = "%empty"
+END_NAME = "$"
+# Column of the parse table used at the end of the input
+END = len(TokenKind)
+
+
+class GrammarError(Exception):
+    pass
+
+
+def is_action(symbol: str) -> bool:
+    return symbol.startswith("@")
+
+
+class Grammar:
+    """Productions of a grammar plus its FIRST and FOLLOW sets."""
+
+    def __init__(self, rules: dict[str, list[list[str]]]):
+        if not rules:
+            raise GrammarError("The grammar has no rules")
+        self.rules = rules
+        self.nonterminals = list(rules)
+        self.start = self.nonterminals[0]
+        self.productions = [
+            (nonterminal, alternative)
+            for nonterminal, alternatives in rules.items()
+            for alternative in alternatives
+        ]
+        self.actions = sorted(
+            {
+                symbol[1:]
+                for _, alternative in self.productions
+                for symbol in alternative
+                if is_action(symbol)
+            }
+        )
+        self._check_symbols()
+        self.first, self.nullable = self._first_sets()
+        self.follow = self._follow_sets()
+
+    @classmethod
+    def parse(cls, text: str) -> "Grammar":
+        rules = {}
+        nonterminal = None
+        for lineno, line in enumerate(text.splitlines(), 1):
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            if "->" in line:
+                nonterminal, line = (part.strip() for part in line.split("->", 1))
+                if nonterminal in rules:
+                    raise GrammarError(f"Line {lineno}: {nonterminal} defined twice")
+                rules[nonterminal] = []
+            elif line.startswith("|") and nonterminal is not None:
+                line = line[1:]
+            else:
+                raise GrammarError(f"Line {lineno}: expected 'name ->' or '|'")
+            symbols = line.split()
+            rules[nonterminal].append([] if symbols == [EMPTY] else symbols)
+        return cls(rules)
+
+    @classmethod
+    def from_file(cls, path: Path) -> "Grammar":
+        return cls.parse(Path(path).read_text(encoding="utf-8"))
+
+    def is_terminal(self, symbol: str) -> bool:
+        return symbol not in self.rules and not is_action(symbol)
+
+    def _check_symbols(self):
+        for nonterminal, alternative in self.productions:
+            for symbol in alternative:
+                if symbol == EMPTY:
+                    raise GrammarError(f"{nonterminal}: {EMPTY} must stand alone")
+                if self.is_terminal(symbol) and symbol not in TokenKind.__members__:
+                    raise GrammarError(
+                        f"{nonterminal}: {symbol} is neither a rule nor a token"
+                    )
+
+    def first_of(self, symbols, first=None, nullable=None):
+        """FIRST set of a sequence of symbols and whether it can be empty."""
+        first = self.first if first is None else first
+        nullable = self.nullable if nullable is None else nullable
+        result = set()
+        for symbol in symbols:
+            if is_action(symbol):
+                continue
+            if self.is_terminal(symbol):
+                result.add(symbol)
+                return result, False
+            result |= first[symbol]
+            if symbol not in nullable:
+                return result, False
+        return result, True
+
+    def _first_sets(self):
+        first = {nonterminal: set() for nonterminal in self.nonterminals}
+        nullable = set()
+        changed = True
+        while changed:
+            changed = False
+            for nonterminal, alternative in self.productions:
+                symbols, empty = self.first_of(alternative, first, nullable)
+                if not symbols <= first[nonterminal]:
+                    first[nonterminal] |= symbols
+                    changed = True
+                if empty and nonterminal not in nullable:
+                    nullable.add(nonterminal)
+                    changed = True
+        return first, nullable
+
+    def _follow_sets(self):
+        follow = {nonterminal: set() for nonterminal in self.nonterminals}
+        follow[self.start].add(END_NAME)
+        changed = True
+        while changed:
+            changed = False
+            for nonterminal, alternative in self.productions:
+                for index, symbol in enumerate(alternative):
+                    if symbol not in self.rules:
+                        continue
+                    symbols, empty = self.first_of(alternative[index + 1 :])
+                    if empty:
+                        symbols |= follow[nonterminal]
+                    if not symbols <= follow[symbol]:
+                        follow[symbol] |= symbols
+                        changed = True
+        return follow
+
+    def table(self) -> dict[str, dict[str, int]]:
+        """Production to expand for every nonterminal and lookahead."""
+        table = {nonterminal: {} for nonterminal in self.nonterminals}
+        conflicts = []
+        for index, (nonterminal, alternative) in enumerate(self.productions):
+            symbols, empty = self.first_of(alternative)
+            if empty:
+                symbols |= self.follow[nonterminal]
+            for terminal in symbols:
+                row = table[nonterminal]
+                if terminal in row and row[terminal] != index:
+                    conflicts.append(
+                        f"{nonterminal} on {terminal}: "
+                        f"{self.format_production(row[terminal])} / "
+                        f"{self.format_production(index)}"
+                    )
+                row.setdefault(terminal, index)
+        if conflicts:
+            raise GrammarError("The grammar is not LL(1):\n" + "\n".join(conflicts))
+        return table
+
+    def format_production(self, index: int) -> str:
+        nonterminal, alternative = self.productions[index]
+        return f"{nonterminal} -> {' '.join(alternative) or EMPTY}"
+
+    def encode(self, symbol: str) -> int:
+        """Number of a symbol in the generated tables: TokenKind values for
+        terminals, END + 1 + index for nonterminals, -1 - index for
+        actions."""
+        if symbol == END_NAME:
+            return END
+        if is_action(symbol):
+            return -1 - self.actions.index(symbol[1:])
+        if symbol in self.rules:
+            return END + 1 + self.nonterminals.index(symbol)
+        return TokenKind[symbol].value
+
+
+def _format_tuple(values, indent: str = "") -> str:
+    text = ", ".join(
+        f'"{value}"' if isinstance(value, str) else str(value) for value in values
+    )
+    if len(values) == 1:
+        text += ","
+    if len(indent) + len(text) <= 86:
+        return f"({text})"
+    lines = textwrap.wrap(text, 84 - len(indent), break_on_hyphens=False)
+    inner = "".join(f"{indent}    {line}\n" for line in lines)
+    return f"(\n{inner}{indent})"
+
+
+def _format_rows(rows) -> str:
+    lines = "".join(f"    {_format_tuple(row, '    ')},\n" for row in rows)
+    return f"(\n{lines})"
+
+
+def generate_table_module(grammar: Grammar, source: str = "grammar.txt") -> str:
+    """Source of the module with the compact parse table of grammar."""
+    table = grammar.table()
+    productions = [
+        tuple(grammar.encode(symbol) for symbol in reversed(alternative))
+        for _, alternative in grammar.productions
+    ]
+    action_counts = [
+        sum(1 for symbol in alternative if is_action(symbol))
+        for _, alternative in grammar.productions
+    ]
+    rows = []
+    for nonterminal in grammar.nonterminals:
+        row = [-1] * (END + 1)
+        for terminal, index in table[nonterminal].items():
+            row[grammar.encode(terminal)] = index
+        rows.append(row)
+    follow = [
+        sorted(grammar.encode(terminal) for terminal in grammar.follow[nonterminal])
+        for nonterminal in grammar.nonterminals
+    ]
+
+    return f'''"""
+    Parse table of table_parser.TableParser, generated by ll1.py from
+    {source}. Do not edit: run ll1.py again after changing the grammar or
+    lexer.TokenKind.
+"""
+
+END = {END}
+START = {grammar.encode(grammar.start)}
+
+NONTERMINALS = {_format_tuple(grammar.nonterminals)}
+
+ACTIONS = {_format_tuple(grammar.actions)}
+
+# Right-hand side of every production, reversed so it can be pushed on the
+# parse stack as is: TokenKind values for terminals, END + 1 + index for
+# nonterminals and -1 - index for actions
+PRODUCTIONS = {_format_rows(productions)}
+
+# Number of actions in every production
+PRODUCTION_ACTIONS = {_format_tuple(action_counts)}
+
+# TABLE[nonterminal][token kind or END] is the production to expand, -1 if
+# there is none
+TABLE = {_format_rows(rows)}
+
+# FOLLOW set of every nonterminal, used to recover from syntax errors
+FOLLOW = tuple(
+    frozenset(kinds)
+    for kinds in {_format_rows(follow)}
+)
+'''
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Build an LL(1) parse table.")
+    arg_parser.add_argument("grammar", type=Path)
+    arg_parser.add_argument("-o", "--output", type=Path)
+    args = arg_parser.parse_args()
+
+    try:
+        grammar = Grammar.from_file(args.grammar)
+        module = generate_table_module(grammar, args.grammar.name)
+    except GrammarError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+
+    if args.output is None:
+        print(module, end="")
+    else:
+        args.output.write_text(module, encoding="utf-8")
+    print(
+        f"{len(grammar.nonterminals)} nonterminals, "
+        f"{len(grammar.productions)} productions, "
+        f"{len(grammar.actions)} actions",
+        file=sys.stderr,
+    )
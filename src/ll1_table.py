@@ -0,0 +1,264 @@
+"""
+    Parse table of table_parser.TableParser, generated by ll1.py from
+    grammar.txt. Do not edit: run ll1.py again after changing the grammar or
+    lexer.TokenKind.
+"""
+
+END = 42
+START = 43
+
+NONTERMINALS = (
+    "program", "declaration_list", "declaration", "type", "first_declarator",
+    "declarator_list", "declarator", "initialization", "sentence_list", "sentence",
+    "block", "else_branch", "assignment_tail", "sent_expression", "expression",
+    "relational_tail", "relational_operator", "logical_expression", "logical_tail",
+    "simple_expression", "simple_tail", "term", "term_tail", "factor", "factor_tail",
+    "component"
+)
+
+ACTIONS = (
+    "assignment", "binary", "block", "declaration", "declarator", "do_while",
+    "empty_statement", "group", "identifier", "if", "initialization", "input", "number",
+    "output", "program", "while"
+)
+
+# Right-hand side of every production, reversed so it can be pushed on the
+# parse stack as is: TokenKind values for terminals, END + 1 + index for
+# nonterminals and -1 - index for actions
+PRODUCTIONS = (
+    (-15, 23, 51, 44, 22, 7),
+    (44, 45),
+    (),
+    (-4, 24, 48, 47, 46),
+    (10,),
+    (6,),
+    (11,),
+    (-11, 50, 14),
+    (48, 49, 21),
+    (),
+    (-5, 50, 14),
+    (57, 25),
+    (),
+    (51, 52),
+    (),
+    (-10, 54, 53, 20, 57, 19, 0),
+    (-16, 53, 20, 57, 19, 3),
+    (-6, 24, 20, 57, 19, 3, 53, 2),
+    (-12, 24, 14, 8),
+    (-14, 24, 57, 9),
+    (-1, 55, 14),
+    (-3, 23, 51, 22),
+    (53, 1),
+    (),
+    (24, 56, 25),
+    (24, 26),
+    (24, 27),
+    (-7, 24),
+    (57,),
+    (58, 60),
+    (-2, 60, 59),
+    (),
+    (35,),
+    (38,),
+    (36,),
+    (39,),
+    (34,),
+    (40,),
+    (61, 62),
+    (61, -2, 62, 12),
+    (61, -2, 62, 13),
+    (),
+    (63, 64),
+    (63, -2, 64, 28),
+    (63, -2, 64, 29),
+    (),
+    (65, 66),
+    (65, -2, 66, 30),
+    (65, -2, 66, 31),
+    (65, -2, 66, 32),
+    (),
+    (67, 68),
+    (67, -2, 68, 33),
+    (),
+    (-8, 20, 57, 19),
+    (-13, 15),
+    (-13, 16),
+    (-13, 17),
+    (-13, 18),
+    (-9, 14),
+)
+
+# Number of actions in every production
+PRODUCTION_ACTIONS = (
+    1, 0, 0, 1, 0, 0, 0, 1, 0, 0, 1, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 1,
+    0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 0, 0, 1, 1, 0, 0, 1, 1, 1, 0, 0, 1, 0, 1, 1,
+    1, 1, 1, 1
+)
+
+# TABLE[nonterminal][token kind or END] is the production to expand, -1 if
+# there is none
+TABLE = (
+    (
+        -1, -1, -1, -1, -1, -1, -1, 0, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+        -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+        -1, -1, -1
+    ),
+    (
+        2, -1, 2, 2, -1, -1, 1, -1, 2, 2, 1, 1, -1, -1, 2, -1, -1, -1, -1, -1, -1, -1,
+        -1, 2, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+        -1
+    ),
+    (
+        -1, -1, -1, -1, -1, -1, 3, -1, -1, -1, 3, 3, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+        -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+        -1, -1
+    ),
+    (
+        -1, -1, -1, -1, -1, -1, 5, -1, -1, -1, 4, 6, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+        -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+        -1, -1
+    ),
+    (
+        -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, 7, -1, -1, -1, -1, -1,
+        -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+        -1, -1, -1
+    ),
+    (
+        -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+        -1, 8, -1, -1, 9, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+        -1, -1, -1
+    ),
+    (
+        -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, 10, -1, -1, -1, -1, -1,
+        -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+        -1, -1, -1
+    ),
+    (
+        -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+        -1, 12, -1, -1, 12, 11, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+        -1, -1, -1
+    ),
+    (
+        13, -1, 13, 13, -1, -1, -1, -1, 13, 13, -1, -1, -1, -1, 13, -1, -1, -1, -1, -1,
+        -1, -1, -1, 14, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+        -1, -1, -1
+    ),
+    (
+        15, -1, 17, 16, -1, -1, -1, -1, 18, 19, -1, -1, -1, -1, 20, -1, -1, -1, -1, -1,
+        -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+        -1, -1, -1
+    ),
+    (
+        -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+        -1, -1, 21, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+        -1, -1, -1
+    ),
+    (
+        23, 22, 23, 23, -1, -1, -1, -1, 23, 23, -1, -1, -1, -1, 23, -1, -1, -1, -1, -1,
+        -1, -1, -1, 23, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+        -1, -1, -1
+    ),
+    (
+        -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+        -1, -1, -1, -1, -1, 24, 25, 26, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+        -1, -1, -1
+    ),
+    (
+        -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, 28, 28, 28, 28, 28, 28,
+        -1, -1, -1, -1, 27, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+        -1, -1, -1
+    ),
+    (
+        -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, 29, 29, 29, 29, 29, 29,
+        -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+        -1, -1, -1
+    ),
+    (
+        -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+        31, 31, -1, -1, 31, -1, -1, -1, -1, -1, -1, -1, -1, -1, 30, 30, 30, -1, 30, 30,
+        30, -1, -1
+    ),
+    (
+        -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+        -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, 36, 32, 34, -1, 33, 35,
+        37, -1, -1
+    ),
+    (
+        -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, 38, 38, 38, 38, 38, 38,
+        -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+        -1, -1, -1
+    ),
+    (
+        -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, 39, 40, -1, -1, -1, -1, -1, -1,
+        41, 41, -1, -1, 41, -1, -1, -1, -1, -1, -1, -1, -1, -1, 41, 41, 41, -1, 41, 41,
+        41, -1, -1
+    ),
+    (
+        -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, 42, 42, 42, 42, 42, 42,
+        -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+        -1, -1, -1
+    ),
+    (
+        -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, 45, 45, -1, -1, -1, -1, -1, -1,
+        45, 45, -1, -1, 45, -1, -1, -1, 43, 44, -1, -1, -1, -1, 45, 45, 45, -1, 45, 45,
+        45, -1, -1
+    ),
+    (
+        -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, 46, 46, 46, 46, 46, 46,
+        -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+        -1, -1, -1
+    ),
+    (
+        -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, 50, 50, -1, -1, -1, -1, -1, -1,
+        50, 50, -1, -1, 50, -1, -1, -1, 50, 50, 47, 48, 49, -1, 50, 50, 50, -1, 50, 50,
+        50, -1, -1
+    ),
+    (
+        -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, 51, 51, 51, 51, 51, 51,
+        -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+        -1, -1, -1
+    ),
+    (
+        -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, 53, 53, -1, -1, -1, -1, -1, -1,
+        53, 53, -1, -1, 53, -1, -1, -1, 53, 53, 53, 53, 53, 52, 53, 53, 53, -1, 53, 53,
+        53, -1, -1
+    ),
+    (
+        -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, 59, 55, 56, 57, 58, 54,
+        -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+        -1, -1, -1
+    ),
+)
+
+# FOLLOW set of every nonterminal, used to recover from syntax errors
+FOLLOW = tuple(
+    frozenset(kinds)
+    for kinds in (
+    (42,),
+    (0, 2, 3, 8, 9, 14, 23),
+    (0, 2, 3, 6, 8, 9, 10, 11, 14, 23),
+    (14,),
+    (21, 24),
+    (24,),
+    (21, 24),
+    (21, 24),
+    (23,),
+    (0, 2, 3, 8, 9, 14, 23),
+    (0, 1, 2, 3, 8, 9, 14, 23),
+    (0, 2, 3, 8, 9, 14, 23),
+    (0, 2, 3, 8, 9, 14, 23),
+    (24,),
+    (20, 21, 24),
+    (20, 21, 24),
+    (14, 15, 16, 17, 18, 19),
+    (20, 21, 24, 34, 35, 36, 38, 39, 40),
+    (20, 21, 24, 34, 35, 36, 38, 39, 40),
+    (12, 13, 20, 21, 24, 34, 35, 36, 38, 39, 40),
+    (12, 13, 20, 21, 24, 34, 35, 36, 38, 39, 40),
+    (12, 13, 20, 21, 24, 28, 29, 34, 35, 36, 38, 39, 40),
+    (12, 13, 20, 21, 24, 28, 29, 34, 35, 36, 38, 39, 40),
+    (12, 13, 20, 21, 24, 28, 29, 30, 31, 32, 34, 35, 36, 38, 39, 40),
+    (12, 13, 20, 21, 24, 28, 29, 30, 31, 32, 34, 35, 36, 38, 39, 40),
+    (12, 13, 20, 21, 24, 28, 29, 30, 31, 32, 33, 34, 35, 36, 38, 39, 40),
+)
+)
@@ -1,10 +1,13 @@
 """Main file of the application."""
 
+# Imported first, so that the time the other imports take counts as startup
+from startup_profile import STARTED, StartupProfile
+
+import argparse
 import sys
 import os
 from pathlib import Path
-from parser_s import Parser
-from lexer import get_lexical_analysis
+from lexer import MappedFile
 
 from PyQt5.QtWidgets import (
     QMainWindow,
@@ -20,18 +23,38 @@ from PyQt5.QtWidgets import (
     QFileDialog,
     QLabel,
 )
-from PyQt5.QtCore import Qt, QDir, QModelIndex
+from PyQt5.QtCore import Qt, QDir, QModelIndex, QThreadPool
 from PyQt5.QtGui import QFont
-from PyQt5.Qsci import QsciScintilla
 
-from components.editor import Editor
+# The editor (QScintilla), the compiler and the analysis panels are imported
+# when they are first needed: the first tab, the first compile, the first
+# time a panel is shown
 from components.menu import set_up_menu
 from components.dock_panels import (
     set_up_dock_panels,
     set_lexical_analysis_result,
     set_syntactic_analysis_result,
+    set_semantic_analysis_result,
+    set_hash_table_result,
+    set_intermediate_code_result,
+    set_execution_result,
+    get_program_inputs,
 )
 from components.side_bar import set_up_sidebar
+from components.startup import StartupTimer
+
+
+# Phases of the startup, reported by --profile-startup
+profile = StartupProfile(STARTED)
+profile.mark("import modules")
+
+STYLESHEET_PATH = "./src/css/style.css"
+
+
+def read_stylesheet() -> str:
+    """Read the stylesheet of the application."""
+    with open(STYLESHEET_PATH, encoding="utf-8") as file:
+        return file.read()
 
 
 class MainWindow(QMainWindow):
@@ -50,6 +73,10 @@ class MainWindow(QMainWindow):
         )  # Create a label to show the cursor position
 
         self.current_file = None  # Variable to store the current file
+        self.compile_worker = None  # Compile running in the background, if any
+        self.results_editor = None  # Editor whose compile the panels show
+        self.compile_cache = None  # Results of earlier compiles, on disk
+        self.live_analysis = True  # Whether editors show errors while typing
 
         self.init_ui()  # Call the method to initialize the UI
 
@@ -61,22 +88,33 @@ class MainWindow(QMainWindow):
         self.window_font = QFont("Monospace", 12)  # Set the font of the window
         self.setFont(self.window_font)  # Set the font of the window
 
-        self.setStyleSheet(open("./src/css/style.css", encoding="utf-8").read())
-
         set_up_menu(self)
+        profile.mark("build menu")
 
         self.set_up_body()
+        profile.mark("build body")
 
         set_up_dock_panels(self)
+        profile.mark("build dock panels")
 
         self.show()
+        profile.mark("show window")
 
-    def get_editor(self) -> QsciScintilla:
+    def get_editor(self):
         """Get the editor widget."""
+        from components.editor import Editor
+
         editor = Editor()
         editor.cursorPositionChangedSignal.connect(self.get_current_line_column)
+        editor.set_live_analysis(self.live_analysis)
         return editor
 
+    def set_live_analysis(self, enabled: bool):
+        """Turn the live analysis of every editor on or off."""
+        self.live_analysis = enabled
+        for i in range(self.tab_view.count()):
+            self.tab_view.widget(i).set_live_analysis(enabled)
+
     def set_new_tab(self, path: Path, is_new_file=False):
         """Set a new tab with the editor."""
         editor = self.get_editor()
@@ -91,31 +129,34 @@ class MainWindow(QMainWindow):
 
         if not path.is_file():
             return
-        if self.is_binary(path):
-            self.statusBar().showMessage("Cannot open binary files", 2000)
-            return
 
-        # Check if the file is already open
-        for i in range(self.tab_view.count()):
-            if self.tab_view.tabText(i) == path.name:
-                self.tab_view.setCurrentIndex(i)
-                self.current_file = path
+        # One mapping of the file serves both the binary check and the text
+        with MappedFile(path) as mapped_file:
+            if self.is_binary(mapped_file):
+                self.statusBar().showMessage("Cannot open binary files", 2000)
                 return
 
-        # Create new tab
-        self.tab_view.addTab(editor, path.name)
-        if not is_new_file:
-            with open(path, "r", encoding="utf-8") as file:
-                editor.setText(file.read())
+            # Check if the file is already open
+            for i in range(self.tab_view.count()):
+                if self.tab_view.tabText(i) == path.name:
+                    self.tab_view.setCurrentIndex(i)
+                    self.current_file = path
+                    return
+
+            # Create new tab
+            self.tab_view.addTab(editor, path.name)
+            editor.setText(mapped_file.text())
         self.setWindowTitle(path.name)
         self.current_file = path
         self.tab_view.setCurrentIndex(self.tab_view.count() - 1)
         self.statusBar().showMessage(f"Opened {path}", 2000)
 
-    def is_binary(self, path: Path) -> bool:
+    def is_binary(self, path: Path | MappedFile) -> bool:
         """Check if a file is binary (e.g. image, video, etc.)"""
-        with open(path, "rb") as file:
-            return b"\0" in file.read(1024)  # Check for null bytes
+        if isinstance(path, MappedFile):
+            return path.is_binary()
+        with MappedFile(path) as mapped_file:
+            return mapped_file.is_binary()
 
     def new_file(self):
         """Create a new file."""
@@ -182,17 +223,83 @@ class MainWindow(QMainWindow):
         editor.copy()
 
     def compile(self):
-        """Compile the current file."""
-        if self.current_file is not None:
-            lexycal_results = get_lexical_analysis(self.current_file)
-            set_lexical_analysis_result(lexycal_results)
-            # if lexycal_results[1] == []:
-            parser = Parser(lexycal_results[0])
-            root_node = parser.parse()
-            set_syntactic_analysis_result(root_node, errors=parser.errors)
-            self.statusBar().showMessage("Compilation successful", 2000)
-            # else:
-            # self.statusBar().showMessage("Compilation failed", 2000)
+        """Compile the text of the current editor in a background thread."""
+        editor = self.tab_view.currentWidget()
+        if editor is None:
+            return
+        # A newer compile makes the running one pointless
+        if self.compile_worker is not None:
+            self.compile_worker.cancel()
+
+        from components.compile_worker import CompileWorker
+        from compile_cache import CompileCache
+
+        if self.compile_cache is None:
+            self.compile_cache = CompileCache()
+        # The buffer is compiled as it is, saved or not and Untitled tabs
+        # too. Its session already holds the tokens of every line, and the
+        # worker reads a snapshot of it so editing can go on meanwhile.
+        worker = CompileWorker(
+            editor.lexer_session.snapshot(),
+            self.compile_cache,
+            inputs=get_program_inputs(),
+        )
+        worker.editor = editor
+        worker.signals.progress.connect(self.compile_progress)
+        worker.signals.finished.connect(self.compile_finished)
+        worker.signals.failed.connect(self.compile_failed)
+        self.compile_worker = worker
+        QThreadPool.globalInstance().start(worker)
+
+    def is_current_compile(self) -> bool:
+        """Whether the signal being handled comes from the latest compile."""
+        return (
+            self.compile_worker is not None
+            and self.sender() is self.compile_worker.signals
+        )
+
+    def compile_progress(self, percent: int):
+        """Show the progress of the running compile."""
+        if self.is_current_compile():
+            self.statusBar().showMessage(f"Compiling... {percent}%")
+
+    def compile_finished(self, result):
+        """Show the results of a compile in the dock panels."""
+        if not self.is_current_compile():
+            return
+        self.results_editor = self.compile_worker.editor
+        self.compile_worker = None
+        set_lexical_analysis_result((result.tokens, result.lexical_errors))
+        set_syntactic_analysis_result(result.ast, errors=result.syntax_errors)
+        set_semantic_analysis_result(result.ast, errors=result.semantic_errors)
+        set_hash_table_result(result.symbols)
+        set_intermediate_code_result(result.intermediate_code, result.optimization)
+        set_execution_result(result.execution)
+        self.statusBar().showMessage("Compilation successful", 2000)
+
+    def go_to_position(self, line: int, column: int):
+        """Move the cursor of the compiled editor to a token of the results."""
+        editor = self.results_editor
+        index = self.tab_view.indexOf(editor) if editor is not None else -1
+        if index < 0:  # the tab was closed since
+            return
+        self.tab_view.setCurrentIndex(index)
+        editor.setCursorPosition(line - 1, column - 1)
+        editor.ensureLineVisible(line - 1)
+        editor.setFocus()
+
+    def compile_failed(self, message: str):
+        """Report a compile that stopped with an exception."""
+        if not self.is_current_compile():
+            return
+        self.compile_worker = None
+        self.statusBar().showMessage(f"Compilation failed: {message}", 5000)
+
+    def closeEvent(self, event):
+        """Stop a running compile before the window closes."""
+        if self.compile_worker is not None:
+            self.compile_worker.cancel()
+        super().closeEvent(event)
 
     def close_tab(self, index):
         """Close the tab at the given index."""
@@ -308,6 +415,33 @@ class MainWindow(QMainWindow):
 
 
 if __name__ == "__main__":
-    app = QApplication([])
+    arg_parser = argparse.ArgumentParser(description="Compiler IDE.")
+    arg_parser.add_argument(
+        "--startup-time",
+        action="store_true",
+        help="print the time to the first paint of the window and quit",
+    )
+    arg_parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="print the time of every startup phase up to the first paint and quit",
+    )
+    arg_parser.add_argument(
+        "--startup-budget",
+        type=float,
+        metavar="MS",
+        help="with --startup-time or --profile-startup, exit with status 1 when "
+        "the first paint takes longer than MS milliseconds",
+    )
+    args, qt_args = arg_parser.parse_known_args()
+
+    app = QApplication(sys.argv[:1] + qt_args)
+    profile.mark("create QApplication")
+    # Applied once to the whole application instead of widget by widget
+    app.setStyleSheet(read_stylesheet())
+    profile.mark("apply stylesheet")
     window = MainWindow()
+    if args.startup_time or args.profile_startup:
+        startup_timer = StartupTimer(profile, args.profile_startup, args.startup_budget)
+        startup_timer.watch(window)
     sys.exit(app.exec())
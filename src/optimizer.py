@@ -0,0 +1,150 @@
+"""
+    Constant folding and algebraic simplification of the AST, run on
+    programs without errors before their code is generated. Arithmetic on
+    two number literals is replaced by its result, computed the way the
+    virtual machine would (an int operation gives a wrapped int), and
+    x + 0, 0 + x, x - 0, x * 1, 1 * x, x / 1 and x ^ 1 by x. Only int
+    literals take part in identities, since a real literal would change the
+    type of the result, and x + 0 needs an int x: for a float, -0.0 + 0 is
+    0.0.
+
+    The input tree is left as it is, for the panels that show it: nodes on
+    the way to a change are copied and the rest are shared.
+"""
+
+import math
+
+from lexer import gc_paused
+from parser_s import Node
+from semantic import number_type
+from virtual_machine import divide, modulo, parse_number, power, wrap
+
+
+FOLDABLE_OPERATORS = frozenset(("PLUS", "MINUS", "TIMES", "DIVIDE", "MOD", "POW"))
+
+
+def evaluate(name: str, left, right):
+    if name == "PLUS":
+        return wrap(left + right)
+    if name == "MINUS":
+        return wrap(left - right)
+    if name == "TIMES":
+        return wrap(left * right)
+    if name == "DIVIDE":
+        return wrap(divide(left, right))
+    if name == "MOD":
+        return modulo(left, right)
+    return power(left, right)
+
+
+def number_text(value) -> str | None:
+    """Literal of a folded value, None when it has none"""
+    if isinstance(value, int):
+        return str(value)
+    if not math.isfinite(value):
+        return None
+    text = repr(value)
+    # Real literals are told from int ones by their "."
+    return text if "." in text else text.replace("e", ".0e")
+
+
+class ConstantFolder:
+    def __init__(self, ast: Node | None):
+        self.ast = ast
+        self.folded = 0  # operations replaced by their result
+        self.simplified = 0  # identities replaced by their operand
+        self.removed = 0  # nodes fewer in the tree
+
+    def fold(self) -> Node | None:
+        """Returns the optimized tree, without recursion."""
+        if self.ast is None:
+            return None
+        stack = [(self.ast, False)]
+        results = []  # optimized subtree of every node done, in order
+        with gc_paused():
+            while stack:
+                node, children_done = stack.pop()
+                if not node.children:
+                    results.append(node)
+                elif children_done:
+                    count = len(node.children)
+                    children = tuple(results[-count:])
+                    del results[-count:]
+                    results.append(self.simplify(node, children))
+                else:
+                    stack.append((node, True))
+                    stack.extend((child, False) for child in reversed(node.children))
+        return results[0]
+
+    def simplify(self, node: Node, children: tuple) -> Node:
+        """node with its optimized children, itself optimized if it can be"""
+        if node.name in FOLDABLE_OPERATORS and len(children) == 2:
+            left, right = children
+            if left.name == "Number" and right.name == "Number":
+                folded = self.fold_operation(node, left, right)
+                if folded is not None:
+                    return folded
+            operand = self.identity_operand(node.name, left, right)
+            if operand is not None:
+                self.simplified += 1
+                self.removed += 2
+                return operand
+        # Nodes compare by identity, so this tells whether any child changed
+        if children == node.children:
+            return node
+        return copy_node(node, node.value, children)
+
+    def fold_operation(self, node: Node, left: Node, right: Node) -> Node | None:
+        try:
+            value = evaluate(
+                node.name,
+                wrap(parse_number(left.value)),
+                wrap(parse_number(right.value)),
+            )
+        except (ArithmeticError, ValueError):
+            return None  # e.g. a division by zero, reported when it runs
+        text = number_text(value)
+        if text is None:
+            return None
+        self.folded += 1
+        self.removed += 2
+        folded = copy_node(node, text, ())
+        folded.name = "Number"
+        folded.type = number_type(text)
+        return folded
+
+    def identity_operand(self, name: str, left: Node, right: Node) -> Node | None:
+        """The operand an identity reduces to, if the operation is one"""
+        right_value = int_literal(right)
+        if right_value == 0 and name == "MINUS":
+            return left
+        if right_value == 0 and name == "PLUS" and left.type == "int":
+            return left
+        if right_value == 1 and name in ("TIMES", "DIVIDE", "POW"):
+            return left
+        left_value = int_literal(left)
+        if left_value == 0 and name == "PLUS" and right.type == "int":
+            return right
+        if left_value == 1 and name == "TIMES":
+            return right
+        return None
+
+    def summary(self) -> str:
+        return (
+            f"Constant folding: {self.folded} operations folded, "
+            f"{self.simplified} identities simplified, {self.removed} nodes removed"
+        )
+
+
+def int_literal(node: Node) -> int | None:
+    if node.name == "Number" and "." not in node.value:
+        return int(node.value)
+    return None
+
+
+def copy_node(node: Node, value, children: tuple) -> Node:
+    copy = Node(node.name, value, children)
+    copy.lineno = node.lineno
+    copy.lexpos = node.lexpos
+    copy.type = node.type
+    return copy
@@ -1,13 +1,55 @@
-from lexer import Token
-from anytree import NodeMixin, RenderTree
-
-
-class Node(NodeMixin):
-    def __init__(self, name, value=None, children=None):
+from collections import deque
+from typing import Iterable
+from lexer import NUMBER_KINDS, Token, TokenKind
+
+
+# Binding strength of the binary operators; all of them group to the left
+_PRECEDENCE = {
+    TokenKind.LT: 0,
+    TokenKind.LE: 0,
+    TokenKind.GT: 0,
+    TokenKind.GE: 0,
+    TokenKind.EQ: 0,
+    TokenKind.NE: 0,
+    TokenKind.AND: 1,
+    TokenKind.OR: 1,
+    TokenKind.PLUS: 2,
+    TokenKind.MINUS: 2,
+    TokenKind.TIMES: 3,
+    TokenKind.DIVIDE: 3,
+    TokenKind.MOD: 3,
+    TokenKind.POW: 4,
+}
+
+
+class Node:
+    """
+    AST node. Children are kept in a tuple and the tree is built bottom-up,
+    so nodes carry no parent reference until link_parents is called. Use
+    anytree_adapter.to_anytree for code that needs the anytree API.
+
+    Nodes built from a token keep its line and column, for reporting errors
+    and uses of identifiers; the others have None in both. The type is left
+    to the semantic analysis to fill in.
+    """
+
+    __slots__ = ("name", "value", "children", "parent", "lineno", "lexpos", "type")
+
+    def __init__(self, name, value=None, children=None, token=None):
         self.name = name
         self.value = value
-        if children:
-            self.children = children
+        # Rules that failed to parse give None, which is left out of the tree
+        children = tuple(children) if children else ()
+        if None in children:
+            children = tuple(child for child in children if child is not None)
+        self.children = children
+        self.parent = None
+        if token is not None:
+            self.lineno = token.lineno
+            self.lexpos = token.lexpos
+        else:
+            self.lineno = self.lexpos = None
+        self.type = None
 
     def __str__(self):
         if self.value:
@@ -15,44 +57,100 @@ class Node(NodeMixin):
         else:
             return f"{self.name}"
 
+    def __repr__(self):
+        return f"Node({self.name!r}, {self.value!r}, {len(self.children)} children)"
+
+    def link_parents(self):
+        """Sets the parent of every node below this one and returns self."""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            for child in node.children:
+                child.parent = node
+            stack.extend(node.children)
+        return self
+
+    def walk(self):
+        """Yields (prefix, node) in pre-order, prefix being the same tree
+        drawing anytree's RenderTree uses."""
+        yield "", self
+        stack = [(self.children, 0, "")]
+        while stack:
+            children, index, indent = stack.pop()
+            if index == len(children):
+                continue
+            stack.append((children, index + 1, indent))
+            child = children[index]
+            last = index == len(children) - 1
+            yield indent + ("└── " if last else "├── "), child
+            if child.children:
+                stack.append(
+                    (child.children, 0, indent + ("    " if last else "│   "))
+                )
+
+    def render(self):
+        return "".join(f"{prefix}{node}\n" for prefix, node in self.walk())
+
 
 class Parser:
-    def __init__(self, tokens: list[Token]):
-        self.tokens = tokens
-        self.current_token_index = 0
-        self.current_token = (
-            self.tokens[self.current_token_index] if self.tokens else None
-        )
+    def __init__(self, tokens: Iterable[Token]):
+        # Tokens are pulled on demand, so a list, a TokenStore or the lazy
+        # stream of lexer.iter_tokens can all be parsed. Only the tokens
+        # peeked past the current one are buffered.
+        self.tokens = iter(tokens)
+        self.lookahead = deque()
+        self.lexical_errors = []
         self.errors = []
+        # Token each syntax error was found at, None at the end of the input
+        self.error_tokens = []
+        self.current_token = self.next_token()
+
+    def next_token(self):
+        if self.lookahead:
+            return self.lookahead.popleft()
+        for token in self.tokens:
+            if token.kind == TokenKind.ERROR:
+                self.lexical_errors.append(token)
+                continue
+            return token
+        return None
+
+    def peek(self, offset=1):
+        while len(self.lookahead) < offset:
+            token = next(self.tokens, None)
+            if token is None:
+                return None
+            if token.kind == TokenKind.ERROR:
+                self.lexical_errors.append(token)
+                continue
+            self.lookahead.append(token)
+        return self.lookahead[offset - 1]
 
     def eat(self, token_type):
-        if self.current_token and self.current_token.type == token_type:
-            self.current_token_index += 1
-            if self.current_token_index < len(self.tokens):
-                self.current_token = self.tokens[self.current_token_index]
-        elif self.current_token and self.current_token.type != None:
-            error_message = f"Unexpected token {self.current_token.type if self.current_token else 'None'}, expected {token_type} at line {self.current_token.lineno if self.current_token else 'None'}, position {self.current_token.lexpos if self.current_token else 'None'}"
-            self.errors.append(error_message)
+        if self.current_token and self.current_token.kind == token_type:
+            # The last token stays current once the input runs out
+            token = self.next_token()
+            if token is not None:
+                self.current_token = token
+        elif self.current_token and self.current_token.kind != None:
+            error_message = f"Unexpected token {self.current_token.type if self.current_token else 'None'}, expected {token_type.name} at line {self.current_token.lineno if self.current_token else 'None'}, position {self.current_token.lexpos if self.current_token else 'None'}"
+            self.report_error(error_message, self.current_token)
             self.synchronize()
 
+    def report_error(self, error_message, token):
+        self.errors.append(error_message)
+        self.error_tokens.append(token)
+
     def synchronize(self):
-        while (
-            self.current_token_index < len(self.tokens)
-            and self.current_token
-            and self.current_token.type not in ["SEMICOLON", "RBRACE", "LBRACE"]
-        ):
-            self.current_token_index += 1
-            if self.current_token_index < len(self.tokens):
-                self.current_token = self.tokens[self.current_token_index]
-            else:
-                self.current_token = None
+        while self.current_token and self.current_token.kind not in [
+            TokenKind.SEMICOLON,
+            TokenKind.RBRACE,
+            TokenKind.LBRACE,
+        ]:
+            self.current_token = self.next_token()
 
-        if self.current_token_index < len(self.tokens):
-            self.current_token_index += 1
-            if self.current_token_index < len(self.tokens):
-                self.current_token = self.tokens[self.current_token_index]
-            else:
-                self.current_token = None
+        if self.current_token:
+            self.current_token = self.next_token()
 
     def parse(self):
         root_node = self.program()
@@ -60,185 +158,222 @@ class Parser:
 
     def program(self):
         token = self.current_token
-        self.eat("MAIN")
-        self.eat("LBRACE")
+        if token is None:  # nothing but blanks and comments
+            self.report_error("Unexpected end of input", None)
+            return None
+        self.eat(TokenKind.MAIN)
+        self.eat(TokenKind.LBRACE)
         declarations = self.declaration_list()
         statements = self.sentence_list()
-        self.eat("RBRACE")
+        self.eat(TokenKind.RBRACE)
         return Node(
-            name="Program", value=token.value, children=declarations + statements
+            name="Program",
+            value=token.value,
+            children=declarations + statements,
+            token=token,
         )
 
     def declaration_list(self):
         declarations = []
-        while self.current_token and self.current_token.type in [
-            "INT",
-            "DOUBLE",
-            "FLOAT",
+        while self.current_token and self.current_token.kind in [
+            TokenKind.INT,
+            TokenKind.DOUBLE,
+            TokenKind.FLOAT,
         ]:
             declarations.append(self.declaration_statement())
         return declarations
 
     def declaration_statement(self):
-        if self.current_token.type == "INT":
+        if self.current_token.kind == TokenKind.INT:
             return self.variable_declaration("int")
-        elif self.current_token.type == "DOUBLE":
+        elif self.current_token.kind == TokenKind.DOUBLE:
             return self.variable_declaration("double")
-        elif self.current_token.type == "FLOAT":
+        elif self.current_token.kind == TokenKind.FLOAT:
             return self.variable_declaration("float")
         else:
             return self.sentence()
 
     def variable_declaration(self, var_type):
-        self.eat(var_type.upper())
+        type_token = self.current_token
+        self.eat(TokenKind[var_type.upper()])
         declarations = self.identifier_with_optional_initialization()
-        self.eat("SEMICOLON")
-        return Node(name="VariableDeclaration", value=var_type, children=declarations)
+        self.eat(TokenKind.SEMICOLON)
+        return Node(
+            name="VariableDeclaration",
+            value=var_type,
+            children=declarations,
+            token=type_token,
+        )
 
     def identifier_with_optional_initialization(self):
         declarations = []
-        identifier_token = self.current_token.value
-        self.eat("IDENTIFIER")
+        identifier_token = self.current_token
+        self.eat(TokenKind.IDENTIFIER)
 
-        if self.current_token and self.current_token.type == "ASSIGN":
-            self.eat("ASSIGN")
+        if self.current_token and self.current_token.kind == TokenKind.ASSIGN:
+            self.eat(TokenKind.ASSIGN)
             initialization_expression = self.expression()
             declarations.append(
                 Node(
                     name="INITIALIZATION",
-                    value=identifier_token,
+                    value=identifier_token.value,
                     children=[initialization_expression],
+                    token=identifier_token,
                 )
             )
         else:
-            declarations.append(Node(name="DECLARATION", value=identifier_token))
-
-        while self.current_token and self.current_token.type == "COMMA":
-            self.eat("COMMA")
-            identifier_token = self.current_token.value
-            self.eat("IDENTIFIER")
-            if self.current_token and self.current_token.type == "ASSIGN":
-                self.eat("ASSIGN")
+            declarations.append(
+                Node(
+                    name="DECLARATION",
+                    value=identifier_token.value,
+                    token=identifier_token,
+                )
+            )
+
+        while self.current_token and self.current_token.kind == TokenKind.COMMA:
+            self.eat(TokenKind.COMMA)
+            identifier_token = self.current_token
+            self.eat(TokenKind.IDENTIFIER)
+            if self.current_token and self.current_token.kind == TokenKind.ASSIGN:
+                self.eat(TokenKind.ASSIGN)
                 initialization_expression = self.expression()
                 declarations.append(
                     Node(
                         name="DECLARATION",
-                        value=identifier_token,
+                        value=identifier_token.value,
                         children=[initialization_expression],
+                        token=identifier_token,
                     )
                 )
             else:
-                declarations.append(Node(name="DECLARATION", value=identifier_token))
+                declarations.append(
+                    Node(
+                        name="DECLARATION",
+                        value=identifier_token.value,
+                        token=identifier_token,
+                    )
+                )
 
         return declarations
 
     def identifier(self):
         ids = []
-        ids.append(self.current_token.value)
-        self.eat("IDENTIFIER")
-        while self.current_token and self.current_token.type == "COMMA":
-            self.eat("COMMA")
-            ids.append(self.current_token.value)
-            self.eat("IDENTIFIER")
-        return [Node(name="Identifier", value=id) for id in ids]
+        ids.append(self.current_token)
+        self.eat(TokenKind.IDENTIFIER)
+        while self.current_token and self.current_token.kind == TokenKind.COMMA:
+            self.eat(TokenKind.COMMA)
+            ids.append(self.current_token)
+            self.eat(TokenKind.IDENTIFIER)
+        return [Node(name="Identifier", value=id.value, token=id) for id in ids]
 
     def sentence_list(self):
         statements = []
-        while self.current_token and self.current_token.type != "RBRACE":
+        while self.current_token and self.current_token.kind != TokenKind.RBRACE:
             statements.append(self.sentence())
         return statements
 
     def sentence(self):
-        if self.current_token.type == "IF":
+        if self.current_token.kind == TokenKind.IF:
             return self.if_statement()
-        elif self.current_token.type == "WHILE":
+        elif self.current_token.kind == TokenKind.WHILE:
             return self.while_loop_sentence()
-        elif self.current_token.type == "DO":
+        elif self.current_token.kind == TokenKind.DO:
             return self.do_while_loop_sentence()
-        elif self.current_token.type == "CIN":
+        elif self.current_token.kind == TokenKind.CIN:
             return self.cin_sentence()
-        elif self.current_token.type == "COUT":
+        elif self.current_token.kind == TokenKind.COUT:
             return self.cout_sentence()
-        elif self.current_token.type == "IDENTIFIER":
+        elif self.current_token.kind == TokenKind.IDENTIFIER:
             return self.assignment_or_increment_decrement()
         else:
             error_message = f"Unexpected token {self.current_token.type if self.current_token else 'None'} Sat line {self.current_token.lineno if self.current_token else 'None'}, position {self.current_token.lexpos if self.current_token else 'None'}"
-            self.errors.append(error_message)
+            self.report_error(error_message, self.current_token)
             self.synchronize()
             return
 
     def assignment_or_increment_decrement(self):
-        identifier_token = self.current_token.value
-        self.eat("IDENTIFIER")
+        identifier_token = self.current_token
+        self.eat(TokenKind.IDENTIFIER)
+        identifier = Node(
+            name="Identifier", value=identifier_token.value, token=identifier_token
+        )
 
-        if self.current_token.type == "ASSIGN":
+        if self.current_token.kind == TokenKind.ASSIGN:
             assign_token = self.current_token
-            self.eat("ASSIGN")
+            self.eat(TokenKind.ASSIGN)
             expression = self.sent_expression()
-            self.eat("SEMICOLON")
+            self.eat(TokenKind.SEMICOLON)
             return Node(
                 "Assignment",
                 value=assign_token.value,
-                children=[Node("Identifier", value=identifier_token), expression],
+                children=[identifier, expression],
+                token=assign_token,
             )
-        elif self.current_token.type == "INCREMENT_OPERATOR":
+        elif self.current_token.kind == TokenKind.INCREMENT_OPERATOR:
             operator_token = self.current_token
-            self.eat("INCREMENT_OPERATOR")
-            self.eat("SEMICOLON")
+            self.eat(TokenKind.INCREMENT_OPERATOR)
+            self.eat(TokenKind.SEMICOLON)
             return Node(
                 name="Increment",
                 value=operator_token.value,
-                children=[Node(name="Identifier", value=identifier_token)],
+                children=[identifier],
+                token=operator_token,
             )
-        elif self.current_token.type == "DECREMENT_OPERATOR":
+        elif self.current_token.kind == TokenKind.DECREMENT_OPERATOR:
             operator_token = self.current_token
-            self.eat("DECREMENT_OPERATOR")
-            self.eat("SEMICOLON")
+            self.eat(TokenKind.DECREMENT_OPERATOR)
+            self.eat(TokenKind.SEMICOLON)
             return Node(
                 name="Decrement",
                 value=operator_token.value,
-                children=[Node("Identifier", value=identifier_token)],
+                children=[identifier],
+                token=operator_token,
             )
         else:
             error_message = f"Unexpected token {self.current_token.type if self.current_token else 'None'}, expected at line {self.current_token.lineno if self.current_token else 'None'}, position {self.current_token.lexpos if self.current_token else 'None'}"
-            self.errors.append(error_message)
+            self.report_error(error_message, self.current_token)
             self.synchronize()
             return
 
     def assignment(self):
-        identifier_token = self.current_token.value
-        self.eat("IDENTIFIER")
+        identifier_token = self.current_token
+        self.eat(TokenKind.IDENTIFIER)
+        identifier = Node(
+            name="Identifier", value=identifier_token.value, token=identifier_token
+        )
         assign_token = self.current_token
-        self.eat("ASSIGN")
+        self.eat(TokenKind.ASSIGN)
         expression = self.sent_expression()
-        self.eat("SEMICOLON")
+        self.eat(TokenKind.SEMICOLON)
         return Node(
             name="Assignment",
             value=assign_token.value,
-            children=[Node(name="Identifier", value=identifier_token), expression],
+            children=[identifier, expression],
+            token=assign_token,
         )
 
     def sent_expression(self):
-        if self.current_token.type == "SEMICOLON":
-            self.eat("SEMICOLON")
+        if self.current_token.kind == TokenKind.SEMICOLON:
+            self.eat(TokenKind.SEMICOLON)
             return Node("EmptyStatement")
         else:
             return self.expression()
 
     def if_statement(self):
-        self.eat("IF")
-        self.eat("LPAREN")
+        if_token = self.current_token
+        self.eat(TokenKind.IF)
+        self.eat(TokenKind.LPAREN)
         condition = self.expression()
-        self.eat("RPAREN")
-        self.eat("LBRACE")
+        self.eat(TokenKind.RPAREN)
+        self.eat(TokenKind.LBRACE)
         true_branch = self.sentence_list()
-        self.eat("RBRACE")
+        self.eat(TokenKind.RBRACE)
 
-        if self.current_token and self.current_token.type == "ELSE":
-            self.eat("ELSE")
-            self.eat("LBRACE")
+        if self.current_token and self.current_token.kind == TokenKind.ELSE:
+            self.eat(TokenKind.ELSE)
+            self.eat(TokenKind.LBRACE)
             false_branch = self.sentence_list()
-            self.eat("RBRACE")
+            self.eat(TokenKind.RBRACE)
             return Node(
                 name="If",
                 value="if",
@@ -249,6 +384,7 @@ class Parser:
                         name="FalseBranch", value="false_branch", children=false_branch
                     ),
                 ],
+                token=if_token,
             )
         else:
             return Node(
@@ -258,146 +394,167 @@ class Parser:
                     condition,
                     Node(name="TrueBranch", value="true_branch", children=true_branch),
                 ],
+                token=if_token,
             )
 
     def while_loop_sentence(self):
-        self.eat("WHILE")
-        self.eat("LPAREN")
+        while_token = self.current_token
+        self.eat(TokenKind.WHILE)
+        self.eat(TokenKind.LPAREN)
         condition = self.expression()
-        self.eat("RPAREN")
-        self.eat("LBRACE")
+        self.eat(TokenKind.RPAREN)
+        self.eat(TokenKind.LBRACE)
         statements = self.sentence_list()
-        self.eat("RBRACE")
-        return Node(name="While", value="while", children=[condition] + statements)
+        self.eat(TokenKind.RBRACE)
+        return Node(
+            name="While",
+            value="while",
+            children=[condition] + statements,
+            token=while_token,
+        )
 
     def do_while_loop_sentence(self):
-        self.eat("DO")
-        self.eat("LBRACE")
+        do_token = self.current_token
+        self.eat(TokenKind.DO)
+        self.eat(TokenKind.LBRACE)
         statements = self.sentence_list()
-        self.eat("RBRACE")
-        self.eat("WHILE")
-        self.eat("LPAREN")
+        self.eat(TokenKind.RBRACE)
+        self.eat(TokenKind.WHILE)
+        self.eat(TokenKind.LPAREN)
         condition = self.expression()
-        self.eat("RPAREN")
-        self.eat("SEMICOLON")
-        return Node(name="DoWhile", value="do_while", children=statements + [condition])
+        self.eat(TokenKind.RPAREN)
+        self.eat(TokenKind.SEMICOLON)
+        return Node(
+            name="DoWhile",
+            value="do_while",
+            children=statements + [condition],
+            token=do_token,
+        )
 
     def cin_sentence(self):
-        identifier = self.current_token.value
-        self.eat("CIN")
-        self.eat("IDENTIFIER")
-        self.eat("SEMICOLON")
-        return Node(name="Input", value=identifier)
+        cin_token = self.current_token
+        self.eat(TokenKind.CIN)
+        identifier = None
+        if self.current_token and self.current_token.kind == TokenKind.IDENTIFIER:
+            identifier = Node(
+                name="Identifier",
+                value=self.current_token.value,
+                token=self.current_token,
+            )
+        self.eat(TokenKind.IDENTIFIER)
+        self.eat(TokenKind.SEMICOLON)
+        return Node(
+            name="Input",
+            value=cin_token.value,
+            children=[identifier],
+            token=cin_token,
+        )
 
     def cout_sentence(self):
-        identifier = self.current_token.value
-        self.eat("COUT")
+        cout_token = self.current_token
+        self.eat(TokenKind.COUT)
         expression = self.expression()
-        self.eat("SEMICOLON")
-        return Node(name="Output", value=identifier, children=[expression])
+        self.eat(TokenKind.SEMICOLON)
+        return Node(
+            name="Output",
+            value=cout_token.value,
+            children=[expression],
+            token=cout_token,
+        )
 
     def expression(self):
-        node = self.logical_expression()
-        if self.current_token and self.current_token.type in [
-            "LT",
-            "LE",
-            "GT",
-            "GE",
-            "EQ",
-            "NE",
-        ]:
-            token = self.current_token
-            self.eat(token.type)
-            node = Node(
-                name=token.type,
-                value=token.value,
-                children=[node, self.logical_expression()],
-            )
-        return node
-
-    def logical_expression(self):
-        node = self.simple_expression()
-        while self.current_token and self.current_token.type in ["AND", "OR"]:
-            token = self.current_token
-            self.eat(token.type)
-            node = Node(
-                name=token.type,
-                value=token.value,
-                children=[node, self.simple_expression()],
-            )
-        return node
-
-    def simple_expression(self):
-        node = self.term()
-        while self.current_token and self.current_token.type in ["PLUS", "MINUS"]:
-            token = self.current_token
-            self.eat(token.type)
-            node = Node(
-                name=token.type, value=token.value, children=[node, self.term()]
-            )
-        return node
-
-    def term(self):
-        node = self.factor()
-        while self.current_token and self.current_token.type in [
-            "TIMES",
-            "DIVIDE",
-            "MOD",
-        ]:
+        """
+        Precedence climbing over an explicit stack, so nesting depth is not
+        bound by the recursion limit. Builds the same trees as the grammar
+        expression -> logical [relop logical], logical -> simple {and|or
+        simple}, simple -> term {+|- term}, term -> factor {*|/|% factor},
+        factor -> component {^ component}.
+        """
+        # Operators waiting for their right operand, as (precedence, left
+        # operand, token); None marks an open parenthesis
+        pending = []
+        # Whether the relational operator of each parenthesis level was seen
+        relational = [False]
+        while True:
             token = self.current_token
-            self.eat(token.type)
-            node = Node(
-                name=token.type, value=token.value, children=[node, self.factor()]
-            )
-        return node
+            while token and token.kind == TokenKind.LPAREN:
+                self.eat(TokenKind.LPAREN)
+                pending.append(None)
+                relational.append(False)
+                if self.current_token is token:
+                    break  # a trailing "(" stays current at the end of input
+                token = self.current_token
+            node = self.component()
+
+            while True:
+                token = self.current_token
+                precedence = _PRECEDENCE.get(token.kind) if token else None
+                if precedence == 0 and relational[-1]:
+                    precedence = None
+
+                while (
+                    pending
+                    and pending[-1] is not None
+                    and (precedence is None or pending[-1][0] >= precedence)
+                ):
+                    _, left, operator = pending.pop()
+                    node = Node(
+                        name=operator.type,
+                        value=operator.value,
+                        children=[left, node],
+                        token=operator,
+                    )
 
-    def factor(self):
-        node = self.component()
-        while self.current_token and self.current_token.type == "POW":
-            token = self.current_token
-            self.eat("POW")
-            node = Node(
-                name=token.type, value=token.value, children=[node, self.component()]
-            )
-        return node
+                if precedence is not None:
+                    self.eat(token.kind)
+                    if precedence == 0:
+                        relational[-1] = True
+                    pending.append((precedence, node, token))
+                    break
+                if not pending:
+                    return node
+                pending.pop()
+                relational.pop()
+                self.eat(TokenKind.RPAREN)
 
     def component(self):
-        if self.current_token.type == "LPAREN":
-            self.eat("LPAREN")
-            node = self.expression()
-            self.eat("RPAREN")
-            return node
-        elif self.current_token.type in [
-            "INTEGER_NUMBER",
-            "REAL_NUMBER",
-            "NEGATIVE_INTEGER_NUMBER",
-            "NEGATIVE_REAL_NUMBER",
-        ]:
-            value = self.current_token.value
-            self.eat(self.current_token.type)
-            return Node(name="Number", value=value)
-        elif self.current_token.type == "IDENTIFIER":
-            identifier = self.current_token.value
-            self.eat("IDENTIFIER")
-            return Node(name="Identifier", value=identifier)
+        token = self.current_token
+        if token and token.kind in NUMBER_KINDS:
+            self.eat(token.kind)
+            return Node(name="Number", value=token.value, token=token)
+        elif token and token.kind == TokenKind.IDENTIFIER:
+            self.eat(TokenKind.IDENTIFIER)
+            return Node(name="Identifier", value=token.value, token=token)
         else:
             error_message = f"Unexpected token {self.current_token.type if self.current_token else 'None'}, at line {self.current_token.lineno if self.current_token else 'None'}, position {self.current_token.lexpos if self.current_token else 'None'}"
-            self.errors.append(error_message)
+            self.report_error(error_message, self.current_token)
             self.synchronize()
             return
 
     def render_tree(self, ast):
-        tree_str = ""
-        for pre, _, node in RenderTree(ast):
-            tree_str += "%s%s\n" % (pre, node)
-        return tree_str
+        return ast.render()
+
+
+# Names of the parser backends; the table-driven one is in table_parser
+PARSER_BACKENDS = ("recursive", "table")
+
+
+def parser_class(backend: str = "recursive") -> type[Parser]:
+    """Parser class of a backend, importing the table-driven one on demand"""
+    if backend == "table":
+        from table_parser import TableParser
+
+        return TableParser
+    if backend != "recursive":
+        raise ValueError(f"Unknown parser backend {backend!r}")
+    return Parser
 
 
 # Example usage
 if __name__ == "__main__":
     import sys
     from pathlib import Path
-    from lexer import get_lexical_analysis
+    from lexer import iter_tokens
 
     args = sys.argv
     if len(args) < 2:
@@ -409,9 +566,7 @@ if __name__ == "__main__":
         if not file_path.exists():
             print("File does not exist")
         else:
-            tkns, errs = get_lexical_analysis(file_path)
-
-            parser = Parser(tkns)
+            parser = Parser(iter_tokens(file_path))
             ast = parser.parse()
 
             # Render the tree as a string
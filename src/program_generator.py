@@ -0,0 +1,213 @@
+"""
+    Seeded generator of valid programs in the language, used as workload for
+    the benchmarks. A program declares a pool of int, float and double
+    variables and then fills main with nested if/else, while and do-while
+    blocks, assignments with deep expressions, increments, cin and cout until
+    it reaches the requested size in bytes.
+
+    Programs are well typed, so they go through every stage of the compiler
+    and run: an expression only reads values that fit its target, % only
+    takes ints, divisors are positive literals and exponents small
+    non-negative ones, so no run stops at a division by zero.
+
+    Usage: python src/program_generator.py SIZE OUTPUT [--seed N]
+"""
+
+from pathlib import Path
+import argparse
+import random
+
+
+TYPES = ("int", "float", "double")
+ARITHMETIC_OPERATORS = ("+", "-", "*", "/", "%", "^")
+REAL_OPERATORS = tuple(op for op in ARITHMETIC_OPERATORS if op != "%")
+RELATIONAL_OPERATORS = ("<", "<=", ">", ">=", "==", "!=")
+LOGICAL_OPERATORS = ("and", "or")
+# Expressions branch into two operands down to this depth; deeper, they
+# go on as a single chain so that their size grows linearly with the depth
+BRANCHING_DEPTH = 6
+DEFAULT_BLOCK_DEPTH = 4
+DEFAULT_EXPRESSION_DEPTH = 6
+
+_SIZE_UNITS = {"": 1, "B": 1, "K": 1 << 10, "KB": 1 << 10, "M": 1 << 20, "MB": 1 << 20}
+
+
+def parse_size(size: str) -> int:
+    """Turns sizes such as "1K", "100MB" or "2048" into a number of bytes."""
+    size = size.strip().upper()
+    digits = size.rstrip("KMB")
+    return int(float(digits) * _SIZE_UNITS[size[len(digits) :]])
+
+
+class ProgramGenerator:
+    """
+    Writes random programs that the lexer, the parser and the semantic
+    analysis accept without errors. The same seed always gives the same
+    program.
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        variables: int = 40,
+        max_block_depth: int = DEFAULT_BLOCK_DEPTH,
+        max_expression_depth: int = DEFAULT_EXPRESSION_DEPTH,
+    ):
+        self.random = random.Random(seed)
+        self.max_block_depth = max_block_depth
+        self.max_expression_depth = max_expression_depth
+        self.variables = {var_type: [] for var_type in TYPES}
+        for index in range(variables):
+            var_type = TYPES[index % len(TYPES)]
+            self.variables[var_type].append(f"{var_type[0]}{index}")
+
+    def declarations(self) -> str:
+        lines = []
+        for var_type, names in self.variables.items():
+            for start in range(0, len(names), 4):
+                group = names[start : start + 4]
+                first = f"{group[0]} = {self.literal(var_type)}"
+                lines.append(f"    {var_type} {', '.join([first] + group[1:])};\n")
+        return "".join(lines)
+
+    def literal(self, var_type: str) -> str:
+        number = str(self.random.randint(1, 999))
+        if var_type != "int" and self.random.random() < 0.5:
+            number += f".{self.random.randint(0, 99)}"
+        return number
+
+    def operand(self, var_type: str) -> str:
+        # Only variables at most as wide as the target, so the value fits it
+        fitting = TYPES[: TYPES.index(var_type) + 1]
+        names = self.variables[self.random.choice(fitting)]
+        if self.random.random() < 0.6:
+            return self.random.choice(names)
+        return self.literal(var_type)
+
+    def expression(self, var_type: str, depth: int = 0) -> str:
+        if depth >= BRANCHING_DEPTH:
+            return self.deep_expression(var_type, depth)
+        if depth >= self.max_expression_depth or self.random.random() < 0.25:
+            return self.operand(var_type)
+        if self.random.random() < 0.2:
+            return f"({self.expression(var_type, depth + 1)})"
+
+        left = self.expression(var_type, depth + 1)
+        operator, right = self.right_operand(var_type)
+        if right is None:
+            right = self.expression(var_type, depth + 1)
+        return self.binary(left, operator, right)
+
+    def deep_expression(self, var_type: str, depth: int) -> str:
+        """
+        The part of an expression below BRANCHING_DEPTH: one chain of
+        operators and parentheses down to max_expression_depth, built in a
+        loop so that its depth is not bounded by Python's recursion limit.
+        """
+        expression = self.operand(var_type)
+        for _ in range(self.max_expression_depth - depth):
+            if self.random.random() < 0.2:
+                expression = f"({expression})"
+                continue
+            operator, right = self.right_operand(var_type)
+            if right is None:
+                right = self.operand(var_type)
+            expression = self.binary(expression, operator, right)
+        return expression
+
+    def right_operand(self, var_type: str) -> tuple[str, str | None]:
+        """A random operator and, when it needs a literal, its right operand"""
+        operators = ARITHMETIC_OPERATORS if var_type == "int" else REAL_OPERATORS
+        operator = self.random.choice(operators)
+        if operator == "^":
+            return operator, str(self.random.randint(0, 3))
+        if operator == "/" or operator == "%":
+            return operator, self.literal(var_type)
+        return operator, None
+
+    @staticmethod
+    def binary(left: str, operator: str, right: str) -> str:
+        if operator == "-" and right[0].isdigit():
+            # "x - 1" would be lexed as "x" followed by the number "-1"
+            right = f"({right})"
+        return f"{left} {operator} {right}"
+
+    def condition(self) -> str:
+        var_type = self.random.choice(TYPES)
+        condition = (
+            f"{self.expression(var_type, 2)} "
+            f"{self.random.choice(RELATIONAL_OPERATORS)} "
+            f"{self.expression(var_type, 2)}"
+        )
+        if self.random.random() < 0.3:
+            logical = self.random.choice(LOGICAL_OPERATORS)
+            condition = f"({condition}) {logical} ({self.condition()})"
+        return condition
+
+    def statement(self, indent: str, depth: int = 0) -> str:
+        choice = self.random.random()
+        if depth < self.max_block_depth and choice < 0.25:
+            return self.block_statement(indent, depth)
+
+        var_type = self.random.choice(TYPES)
+        target = self.random.choice(self.variables[var_type])
+        if choice < 0.75:
+            return f"{indent}{target} = {self.expression(var_type)};\n"
+        if choice < 0.85:
+            return f"{indent}{target}{self.random.choice(('++', '--'))};\n"
+        if choice < 0.92:
+            return f"{indent}cin {target};\n"
+        return f"{indent}cout {self.expression(var_type)};\n"
+
+    def block(self, indent: str, depth: int) -> str:
+        inner = indent + "    "
+        body = "".join(
+            self.statement(inner, depth + 1)
+            for _ in range(self.random.randint(1, 4))
+        )
+        return "{\n" + body + indent + "}"
+
+    def block_statement(self, indent: str, depth: int) -> str:
+        kind = self.random.randrange(4)
+        if kind == 0:
+            return f"{indent}if ({self.condition()}) {self.block(indent, depth)}\n"
+        if kind == 1:
+            return (
+                f"{indent}if ({self.condition()}) {self.block(indent, depth)}"
+                f" else {self.block(indent, depth)}\n"
+            )
+        if kind == 2:
+            return f"{indent}while ({self.condition()}) {self.block(indent, depth)}\n"
+        return (
+            f"{indent}do {self.block(indent, depth)}"
+            f" while ({self.condition()});\n"
+        )
+
+    def chunks(self, size: int):
+        """Yields the program in pieces until it is about size bytes long."""
+        header = "main {\n" + self.declarations()
+        yield header
+        written = len(header) + 2
+        while written < size:
+            statement = self.statement("    ")
+            written += len(statement)
+            yield statement
+        yield "}\n"
+
+    def generate(self, size: int) -> str:
+        return "".join(self.chunks(size))
+
+    def write(self, path: Path, size: int):
+        with open(path, "w", encoding="utf-8") as f:
+            for chunk in self.chunks(size):
+                f.write(chunk)
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Generate a random program.")
+    arg_parser.add_argument("size", help="approximate size, e.g. 1K, 10MB")
+    arg_parser.add_argument("output", type=Path)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args()
+
+    ProgramGenerator(args.seed).write(args.output, parse_size(args.size))
@@ -0,0 +1,180 @@
+"""
+    Semantic analysis of the AST. One walk over the tree, with an explicit
+    stack instead of recursion, fills the symbol table and sets the type of
+    every expression node, and of every declaration and assignment, once
+    the types of its children are known. Undeclared and duplicate variables
+    and values that do not fit the type they are given are reported with
+    their line and column.
+"""
+
+from parser_s import Node
+from symbol_table import SCOPE_NODES, SymbolTable
+
+
+# Numeric types, from narrowest to widest. A value fits any type at least as
+# wide as its own.
+NUMERIC_RANKS = {"int": 0, "float": 1, "double": 2}
+BOOL = "bool"  # type of relational and logical expressions
+
+ARITHMETIC_OPERATORS = frozenset(("PLUS", "MINUS", "TIMES", "DIVIDE", "POW"))
+ORDER_OPERATORS = frozenset(("LT", "LE", "GT", "GE"))
+EQUALITY_OPERATORS = frozenset(("EQ", "NE"))
+LOGICAL_OPERATORS = frozenset(("AND", "OR"))
+
+
+def number_type(value: str) -> str:
+    """Type of a number literal: real literals are floats."""
+    return "float" if "." in value else "int"
+
+
+class SemanticAnalyzer:
+    def __init__(self, ast: Node | None):
+        self.ast = ast
+        self.symbols = SymbolTable()
+        self.errors = []
+
+    def report_error(self, message: str, node: Node):
+        self.errors.append(f"{message}, at line {node.lineno}, position {node.lexpos}")
+
+    def analyze(self):
+        """Annotates the AST in place and returns the symbol table."""
+        symbols = self.symbols
+        # Nodes to enter, and (node,) for nodes whose children are all done
+        stack = [self.ast] if self.ast is not None else []
+        declared_type = None  # of the VariableDeclaration being walked
+        while stack:
+            node = stack.pop()
+            if type(node) is tuple:
+                self.leave(node[0], declared_type)
+                continue
+
+            name = node.name
+            if name == "Number":
+                node.type = number_type(node.value)
+                continue
+            if name == "Identifier":
+                if node.value is not None:
+                    symbol = symbols.use(node.value, node.lineno, node.lexpos)
+                    if symbol is None:
+                        self.report_error(
+                            f"Variable '{node.value}' is not declared", node
+                        )
+                    else:
+                        node.type = symbol.type
+                continue
+            if name == "VariableDeclaration":
+                declared_type = node.value
+            elif name in SCOPE_NODES:
+                symbols.enter_scope()
+            stack.append((node,))
+            stack.extend(reversed(node.children))
+        return symbols
+
+    def leave(self, node: Node, declared_type: str | None):
+        """Checks a node once its children have been analyzed."""
+        name = node.name
+        children = node.children
+        if name in ARITHMETIC_OPERATORS or name == "MOD":
+            if len(children) == 2:
+                node.type = self.arithmetic_type(node, *children)
+        elif name in ORDER_OPERATORS or name in EQUALITY_OPERATORS:
+            if len(children) == 2:
+                self.check_comparison(node, *children)
+            node.type = BOOL
+        elif name in LOGICAL_OPERATORS:
+            if len(children) == 2:
+                self.check_logical(node, *children)
+            node.type = BOOL
+        elif name == "Assignment":
+            if len(children) == 2:
+                target, value = children
+                node.type = target.type
+                self.check_fits(value, target.type, target.value, node)
+        elif name == "DECLARATION" or name == "INITIALIZATION":
+            # Declared after its initial value is checked, which therefore
+            # cannot use the variable itself
+            node.type = declared_type
+            if children:
+                self.check_fits(children[0], declared_type, node.value, node)
+            if node.value is not None:
+                self.declare(node, declared_type)
+        elif name == "Increment" or name == "Decrement":
+            if children:
+                node.type = children[0].type
+        elif name in SCOPE_NODES:
+            self.symbols.exit_scope()
+
+    def declare(self, node: Node, declared_type: str):
+        visible = self.symbols.lookup(node.value)
+        if self.symbols.declare(node.value, declared_type, node.lineno, node.lexpos):
+            return
+        self.report_error(
+            f"Variable '{node.value}' is declared twice (first at line "
+            f"{visible.lineno}, position {visible.lexpos})",
+            node,
+        )
+
+    def arithmetic_type(self, node: Node, left: Node, right: Node) -> str | None:
+        """Type of an arithmetic operation: the wider of its operands."""
+        left_type, right_type = left.type, right.type
+        if left_type is None or right_type is None:
+            return None  # already reported
+        if left_type == BOOL or right_type == BOOL:
+            self.report_error(
+                f"Operator '{node.value}' cannot be applied to {left_type} and "
+                f"{right_type}",
+                node,
+            )
+            return None
+        if node.name == "MOD" and (left_type != "int" or right_type != "int"):
+            self.report_error(
+                f"Operator '%' needs int operands, not {left_type} and "
+                f"{right_type}",
+                node,
+            )
+            return None
+        if NUMERIC_RANKS[left_type] >= NUMERIC_RANKS[right_type]:
+            return left_type
+        return right_type
+
+    def check_comparison(self, node: Node, left: Node, right: Node):
+        left_type, right_type = left.type, right.type
+        if left_type is None or right_type is None:
+            return
+        if left_type == BOOL or right_type == BOOL:
+            # Booleans are only compared for (in)equality with each other
+            if node.name in ORDER_OPERATORS or left_type != right_type:
+                self.report_error(
+                    f"Operator '{node.value}' cannot compare {left_type} and "
+                    f"{right_type}",
+                    node,
+                )
+
+    def check_logical(self, node: Node, left: Node, right: Node):
+        left_type, right_type = left.type, right.type
+        if left_type is None or right_type is None:
+            return
+        if left_type != BOOL or right_type != BOOL:
+            # and/or bind tighter than comparisons, so "x < 1 and y > 2"
+            # applies and to 1 and y
+            self.report_error(
+                f"Operator '{node.value}' needs bool operands, not {left_type} "
+                f"and {right_type} (comparisons around it need parentheses)",
+                node,
+            )
+
+    def check_fits(self, value: Node, target_type, target_name, node: Node):
+        """Reports a value that does not fit the variable it is given to."""
+        value_type = value.type
+        if value_type is None or target_type is None:
+            return  # nothing to assign, or already reported
+        if value_type == BOOL:
+            fits = False
+        else:
+            fits = NUMERIC_RANKS[value_type] <= NUMERIC_RANKS[target_type]
+        if not fits:
+            self.report_error(
+                f"Type mismatch: cannot assign {value_type} to {target_type} "
+                f"variable '{target_name}'",
+                node,
+            )
@@ -0,0 +1,215 @@
+"""
+    Symbol table of a program. Names live in an open addressing hash table
+    with linear probing, keyed by interned identifier strings. The slot of a
+    name holds the innermost symbol visible under it; a symbol declared in a
+    nested block links to the one it shadows, which is put back in the slot
+    when the block ends. Keys are never removed, so probe sequences stay
+    valid without tombstones.
+"""
+
+from array import array
+import sys
+
+
+INITIAL_CAPACITY = 64  # a power of two, like every later capacity
+MAX_LOAD_FACTOR = 0.7
+# Blocks with their own scope
+SCOPE_NODES = frozenset(("TrueBranch", "FalseBranch", "While", "DoWhile"))
+# Columns of the bucket map in the report
+LAYOUT_WIDTH = 64
+
+
+class Symbol:
+    """A declared variable and every place it is used."""
+
+    __slots__ = ("name", "type", "lineno", "lexpos", "depth", "uses", "shadowed")
+
+    def __init__(self, name, type, lineno, lexpos, depth, shadowed=None):
+        self.name = name
+        self.type = type
+        self.lineno = lineno
+        self.lexpos = lexpos
+        self.depth = depth  # 0 for the program's own declarations
+        self.uses = array("i")  # line and column of every use, in pairs
+        self.shadowed = shadowed  # symbol of the same name in an outer scope
+
+    def add_use(self, lineno, lexpos):
+        self.uses.append(lineno or 0)
+        self.uses.append(lexpos or 0)
+
+    def use_sites(self) -> list[tuple[int, int]]:
+        uses = self.uses
+        return [(uses[i], uses[i + 1]) for i in range(0, len(uses), 2)]
+
+    def __repr__(self):
+        return (
+            f"Symbol({self.name!r}, {self.type!r}, line {self.lineno}, "
+            f"{len(self.uses) // 2} uses)"
+        )
+
+
+class SymbolTable:
+    def __init__(self, capacity: int = INITIAL_CAPACITY):
+        self.keys = [None] * capacity
+        self.slots = [None] * capacity  # visible symbol of every key, or None
+        self.size = 0  # keys stored
+        self.depth = 0
+        self.scopes = [[]]  # slots declared in every open scope
+        self.symbols = []  # every symbol declared, in order
+        # Uses of names without a visible declaration, as (name, line, column)
+        self.unresolved = []
+        self.lookups = 0
+        self.probes = 0
+        self.max_probes = 0
+        self.resizes = 0
+
+    def _find(self, name: str) -> int:
+        """Slot of name, or the empty slot where it would go."""
+        keys = self.keys
+        mask = len(keys) - 1
+        index = hash(name) & mask
+        probes = 1
+        key = keys[index]
+        while key is not None and key is not name and key != name:
+            index = (index + 1) & mask
+            probes += 1
+            key = keys[index]
+        self.lookups += 1
+        self.probes += probes
+        if probes > self.max_probes:
+            self.max_probes = probes
+        return index
+
+    def _grow(self):
+        keys, slots = self.keys, self.slots
+        capacity = len(keys) * 2
+        self.keys = [None] * capacity
+        self.slots = [None] * capacity
+        mask = capacity - 1
+        # Slots of the open scopes move with their keys
+        moved = {}
+        for old_index, key in enumerate(keys):
+            if key is None:
+                continue
+            index = hash(key) & mask
+            while self.keys[index] is not None:
+                index = (index + 1) & mask
+            self.keys[index] = key
+            self.slots[index] = slots[old_index]
+            moved[old_index] = index
+        self.scopes = [[moved[index] for index in scope] for scope in self.scopes]
+        self.resizes += 1
+
+    def declare(self, name: str, type, lineno=None, lexpos=None) -> Symbol | None:
+        """
+        Declares name in the current scope and returns its symbol, or None
+        when the scope already declares it.
+        """
+        index = self._find(name)
+        visible = self.slots[index]
+        if visible is not None and visible.depth == self.depth:
+            return None
+        if self.keys[index] is None:
+            if (self.size + 1) > MAX_LOAD_FACTOR * len(self.keys):
+                self._grow()
+                index = self._find(name)
+            self.keys[index] = sys.intern(name)
+            self.size += 1
+        symbol = Symbol(name, type, lineno, lexpos, self.depth, visible)
+        self.slots[index] = symbol
+        self.scopes[-1].append(index)
+        self.symbols.append(symbol)
+        return symbol
+
+    def lookup(self, name: str) -> Symbol | None:
+        """The symbol name refers to in the current scope, if any."""
+        return self.slots[self._find(name)]
+
+    def use(self, name: str, lineno=None, lexpos=None) -> Symbol | None:
+        """Records a use of name and returns the symbol it refers to."""
+        symbol = self.slots[self._find(name)]
+        if symbol is None:
+            self.unresolved.append((name, lineno, lexpos))
+        else:
+            symbol.add_use(lineno, lexpos)
+        return symbol
+
+    def enter_scope(self):
+        self.depth += 1
+        self.scopes.append([])
+
+    def exit_scope(self):
+        """Leaves the current scope, uncovering the symbols it shadowed."""
+        slots = self.slots
+        for index in reversed(self.scopes.pop()):
+            slots[index] = slots[index].shadowed
+        self.depth -= 1
+
+    def statistics(self) -> dict:
+        """Size, load factor, probing and clustering of the table."""
+        clusters = []
+        run = 0
+        for key in self.keys:
+            if key is None:
+                if run:
+                    clusters.append(run)
+                run = 0
+            else:
+                run += 1
+        if run:
+            clusters.append(run)
+        return {
+            "capacity": len(self.keys),
+            "keys": self.size,
+            "symbols": len(self.symbols),
+            "load_factor": self.size / len(self.keys),
+            "resizes": self.resizes,
+            "lookups": self.lookups,
+            "average_probes": self.probes / self.lookups if self.lookups else 0.0,
+            "max_probes": self.max_probes,
+            "clusters": len(clusters),
+            "longest_cluster": max(clusters, default=0),
+            "unresolved_uses": len(self.unresolved),
+        }
+
+    def displacement(self, index: int) -> int:
+        """How many slots the key in index sits past its home slot."""
+        mask = len(self.keys) - 1
+        return (index - (hash(self.keys[index]) & mask)) & mask
+
+    def layout(self) -> str:
+        """
+        Map of the buckets, LAYOUT_WIDTH to a line: "." for an empty one, the
+        displacement of its key when it is below 10 and "+" otherwise.
+        """
+        lines = []
+        for start in range(0, len(self.keys), LAYOUT_WIDTH):
+            line = []
+            for index in range(start, min(start + LAYOUT_WIDTH, len(self.keys))):
+                if self.keys[index] is None:
+                    line.append(".")
+                else:
+                    distance = self.displacement(index)
+                    line.append(str(distance) if distance < 10 else "+")
+            lines.append(f"{start:>8} {''.join(line)}")
+        return "\n".join(lines)
+
+    def report(self) -> str:
+        """Statistics, symbols and bucket map, as shown in the Hash Table panel."""
+        lines = [
+            f"{name.replace('_', ' ').capitalize():<18} "
+            + (f"{value:.3f}" if isinstance(value, float) else f"{value}")
+            for name, value in self.statistics().items()
+        ]
+        lines.append("")
+        lines.append(f"{'Name':<20} {'Type':<8} {'Line':>6} {'Column':>6} {'Uses':>6}")
+        for symbol in self.symbols:
+            lines.append(
+                f"{symbol.name:<20} {str(symbol.type):<8} {symbol.lineno or '':>6} "
+                f"{symbol.lexpos or '':>6} {len(symbol.uses) // 2:>6}"
+            )
+        lines.append("")
+        lines.append("Buckets")
+        lines.append(self.layout())
+        return "\n".join(lines)
+
@@ -0,0 +1,283 @@
+"""
+    Table-driven LL(1) backend of the parser. The parse loop expands
+    nonterminals with the productions of ll1_table, generated by ll1.py from
+    grammar.txt, and the grammar actions build the same AST as
+    parser_s.Parser. On a syntax error the offending tokens are skipped until
+    one can start the pending rule or belongs to its FOLLOW set.
+"""
+
+from typing import Iterable
+
+from lexer import Token, TokenKind
+from ll1_table import (
+    ACTIONS,
+    END,
+    FOLLOW,
+    PRODUCTION_ACTIONS,
+    PRODUCTIONS,
+    START,
+    TABLE,
+)
+from parser_s import Node, Parser
+
+
+def _nodes(items) -> list:
+    return [item for item in items if isinstance(item, Node)]
+
+
+def _token(items, *kinds):
+    for item in items:
+        if isinstance(item, Token) and item.kind in kinds:
+            return item
+    return None
+
+
+def _block(items):
+    for item in items:
+        if isinstance(item, list):
+            return item
+    return []
+
+
+class TableParser(Parser):
+    def __init__(self, tokens: Iterable[Token]):
+        super().__init__(tokens)
+        self.actions = [getattr(self, f"action_{name}") for name in ACTIONS]
+
+    def parse(self):
+        # Terminals push their token on the value stack; an action replaces
+        # the values its production left there with the node it builds
+        stack = [END, START]
+        values = []
+        # Height of the value stack when the production of every pending
+        # action was expanded
+        bases = []
+        actions = self.actions
+        # Rows indexed by the nonterminal's symbol itself
+        table = [None] * START + list(TABLE)
+        productions = PRODUCTIONS
+        production_actions = PRODUCTION_ACTIONS
+        pop = stack.pop
+        push = stack.extend
+        next_token = self.next_token
+
+        token = self.current_token
+        kind = END if token is None else token.kind
+        while stack:
+            symbol = pop()
+            if symbol > END:
+                production = table[symbol][kind]
+                if production >= 0:
+                    right_side = productions[production]
+                    if right_side:
+                        push(right_side)
+                        count = production_actions[production]
+                        if count:
+                            bases.extend([len(values)] * count)
+                else:
+                    self.report_error(self.error_message(token), token)
+                    token, kind = self.recover(symbol, token, kind)
+                    if table[symbol][kind] >= 0:
+                        stack.append(symbol)
+            elif symbol < 0:
+                base = bases.pop()
+                items = values[base:]
+                del values[base:]
+                result = actions[-1 - symbol](items, values)
+                if result is not None:
+                    values.append(result)
+            elif symbol == kind:
+                if kind == END:
+                    break
+                values.append(token)
+                token = next_token()
+                kind = END if token is None else token.kind
+            elif symbol == END:
+                self.report_error(
+                    self.error_message(token, " after the end of the program"), token
+                )
+                break
+            else:
+                # Go on as if the missing token had been there
+                expected = f", expected {TokenKind(symbol).name}"
+                self.report_error(self.error_message(token, expected), token)
+
+        self.current_token = token
+        nodes = _nodes(values)
+        return nodes[0] if nodes else None
+
+    def recover(self, symbol, token, kind):
+        """Skips tokens until one can start the rule symbol or follow it."""
+        row = TABLE[symbol - START]
+        follow = FOLLOW[symbol - START]
+        while kind != END and row[kind] < 0 and kind not in follow:
+            token = self.next_token()
+            kind = END if token is None else token.kind
+        return token, kind
+
+    def error_message(self, token, detail=""):
+        if token is None:
+            return f"Unexpected end of input{detail}"
+        return (
+            f"Unexpected token {token.type}{detail} at line {token.lineno}, "
+            f"position {token.lexpos}"
+        )
+
+    # Grammar actions. items are the values left by the symbols before the
+    # action in its alternative; symbols lost to a syntax error leave nothing,
+    # so the actions look values up instead of relying on their positions.
+
+    def action_program(self, items, values):
+        return Node(
+            name="Program",
+            value="main",
+            children=_nodes(items),
+            token=_token(items, TokenKind.MAIN),
+        )
+
+    def action_declaration(self, items, values):
+        var_type = _token(items, TokenKind.INT, TokenKind.DOUBLE, TokenKind.FLOAT)
+        return Node(
+            name="VariableDeclaration",
+            value=var_type.value if var_type else None,
+            children=_nodes(items),
+            token=var_type,
+        )
+
+    def action_initialization(self, items, values):
+        identifier = _token(items, TokenKind.IDENTIFIER)
+        name = identifier.value if identifier else None
+        if _token(items, TokenKind.ASSIGN):
+            return Node(
+                name="INITIALIZATION",
+                value=name,
+                children=_nodes(items),
+                token=identifier,
+            )
+        return Node(name="DECLARATION", value=name, token=identifier)
+
+    def action_declarator(self, items, values):
+        identifier = _token(items, TokenKind.IDENTIFIER)
+        return Node(
+            name="DECLARATION",
+            value=identifier.value if identifier else None,
+            children=_nodes(items),
+            token=identifier,
+        )
+
+    def action_block(self, items, values):
+        return _nodes(items)
+
+    def action_if(self, items, values):
+        else_token = _token(items, TokenKind.ELSE)
+        split = items.index(else_token) if else_token else len(items)
+        nodes = _nodes(items[:split])
+        condition = nodes[0] if nodes else None
+        children = [
+            condition,
+            Node(
+                name="TrueBranch", value="true_branch", children=_block(items[:split])
+            ),
+        ]
+        if else_token:
+            children.append(
+                Node(
+                    name="FalseBranch",
+                    value="false_branch",
+                    children=_block(items[split:]),
+                )
+            )
+        return Node(
+            name="If", value="if", children=children, token=_token(items, TokenKind.IF)
+        )
+
+    def action_while(self, items, values):
+        return Node(
+            name="While",
+            value="while",
+            children=_nodes(items) + _block(items),
+            token=_token(items, TokenKind.WHILE),
+        )
+
+    def action_do_while(self, items, values):
+        return Node(
+            name="DoWhile",
+            value="do_while",
+            children=_block(items) + _nodes(items),
+            token=_token(items, TokenKind.DO),
+        )
+
+    def action_input(self, items, values):
+        identifier = _token(items, TokenKind.IDENTIFIER)
+        children = []
+        if identifier is not None:
+            children.append(
+                Node(name="Identifier", value=identifier.value, token=identifier)
+            )
+        return Node(
+            name="Input",
+            value="cin",
+            children=children,
+            token=_token(items, TokenKind.CIN),
+        )
+
+    def action_output(self, items, values):
+        return Node(
+            name="Output",
+            value="cout",
+            children=_nodes(items),
+            token=_token(items, TokenKind.COUT),
+        )
+
+    def action_assignment(self, items, values):
+        identifier = _token(items, TokenKind.IDENTIFIER)
+        operator = _token(
+            items,
+            TokenKind.ASSIGN,
+            TokenKind.INCREMENT_OPERATOR,
+            TokenKind.DECREMENT_OPERATOR,
+        )
+        if identifier is None or operator is None:
+            return None
+        target = Node(name="Identifier", value=identifier.value, token=identifier)
+        if operator.kind == TokenKind.ASSIGN:
+            return Node(
+                name="Assignment",
+                value=operator.value,
+                children=[target] + _nodes(items),
+                token=operator,
+            )
+        if operator.kind == TokenKind.INCREMENT_OPERATOR:
+            return Node(
+                name="Increment",
+                value=operator.value,
+                children=[target],
+                token=operator,
+            )
+        return Node(
+            name="Decrement", value=operator.value, children=[target], token=operator
+        )
+
+    def action_empty_statement(self, items, values):
+        return Node("EmptyStatement")
+
+    def action_binary(self, items, values):
+        # The left operand was reduced before the operator was seen
+        left = values.pop() if values and isinstance(values[-1], Node) else None
+        operator = items[0]
+        return Node(
+            name=operator.type,
+            value=operator.value,
+            children=[left] + _nodes(items),
+            token=operator,
+        )
+
+    def action_group(self, items, values):
+        nodes = _nodes(items)
+        return nodes[0] if nodes else None
+
+    def action_number(self, items, values):
+        return Node(name="Number", value=items[0].value, token=items[0])
+
+    def action_identifier(self, items, values):
+        return Node(name="Identifier", value=items[0].value, token=items[0])
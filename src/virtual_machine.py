@@ -0,0 +1,378 @@
+"""
+    Register-based virtual machine that runs a program compiled from its
+    intermediate code. Every variable, constant and temporary of the code
+    gets a register; labels are resolved to addresses and dropped, so the
+    bytecode is a flat list of (opcode, destination, source, source) ints
+    that the dispatch loop reads four at a time.
+
+    Values follow the language: ints are 32 bits wide and wrap around like
+    a C++ int, divide and take remainders truncating toward zero,
+    comparisons give 1 or 0 and variables start at 0. Values
+    copied or read into a variable take its declared type, so a float
+    variable holds a float even when given an int. A step budget stops
+    programs that loop for too long.
+"""
+
+from array import array
+import math
+import time
+
+from intermediate_code import IntermediateCode, NO_OPERAND, Opcode, OperandKind
+
+
+DEFAULT_STEP_BUDGET = 10_000_000
+# Instructions run between two checks for cancellation by the caller. With
+# ints of a fixed width no instruction takes long, so this bounds the wait.
+RUN_CHUNK = 1 << 14
+# Lines of output kept; later ones are only counted
+OUTPUT_LIMIT = 100_000
+
+# Opcodes of the bytecode only, after those of the intermediate code
+HALT = max(Opcode) + 1  # ends every program
+COPY_FLOAT = HALT + 1  # COPY into a float or double variable
+READ_INT = HALT + 2  # READ into an int variable
+READ_FLOAT = HALT + 3  # READ into a float or double variable
+
+REAL_TYPES = frozenset(("float", "double"))
+
+INT_BITS = 32
+INT_MIN = -(1 << (INT_BITS - 1))
+INT_MAX = (1 << (INT_BITS - 1)) - 1
+
+
+class RuntimeFault(Exception):
+    """Raised by the machine when a program cannot go on"""
+
+
+class Bytecode:
+    """
+    A program ready to run: its instructions, four ints each, and the
+    initial value of every register
+    """
+
+    __slots__ = ("code", "registers", "variables", "origins")
+
+    def __init__(self, code: array, registers: list, variables: dict, origins: array):
+        self.code = code
+        self.registers = registers
+        self.variables = variables  # register of every variable, by name
+        # Index in the intermediate code of every instruction, for errors
+        self.origins = origins
+
+    def __len__(self):
+        return len(self.code) // 4
+
+    @classmethod
+    def from_intermediate_code(cls, intermediate: IntermediateCode) -> "Bytecode":
+        names = intermediate.names
+        types = intermediate.types
+        # Registers of the names first, then of the temporaries, which are
+        # numbered from 1
+        registers = [0] * (len(names) + intermediate.temporaries)
+        temporaries_base = len(names) - 1
+        variables = {}
+
+        def register(operand: int) -> int:
+            if operand == NO_OPERAND:
+                return 0
+            kind = operand & 3
+            number = operand >> 2
+            if kind == OperandKind.TEMPORARY:
+                return temporaries_base + number
+            if kind == OperandKind.CONSTANT:
+                registers[number] = wrap(parse_number(names[number]))
+            else:
+                variables[names[number]] = number
+                if types[number] in REAL_TYPES:
+                    registers[number] = 0.0
+            return number
+
+        def typed(opcode: int, result: int) -> int:
+            """Opcode that gives the value the type of the variable result"""
+            if result & 3 != OperandKind.VARIABLE:
+                return opcode
+            real = types[result >> 2] in REAL_TYPES
+            if opcode == Opcode.COPY:
+                return COPY_FLOAT if real else opcode
+            if types[result >> 2] is None:
+                return opcode
+            return READ_FLOAT if real else READ_INT
+
+        # Address of every label, counting instructions without the labels
+        addresses = {}
+        address = 0
+        for opcode, result in zip(intermediate.opcodes, intermediate.results):
+            if opcode == Opcode.LABEL:
+                addresses[result] = address * 4
+            else:
+                address += 1
+
+        code = array("i")
+        origins = array("i")
+        for index, (opcode, result, arg1, arg2) in enumerate(
+            zip(
+                intermediate.opcodes,
+                intermediate.results,
+                intermediate.args1,
+                intermediate.args2,
+            )
+        ):
+            if opcode == Opcode.LABEL:
+                continue
+            if opcode in (Opcode.GOTO, Opcode.IF_FALSE, Opcode.IF_TRUE):
+                destination = addresses[result]
+            else:
+                destination = register(result)
+                if opcode == Opcode.COPY or opcode == Opcode.READ:
+                    opcode = typed(opcode, result)
+            code.extend((opcode, destination, register(arg1), register(arg2)))
+            origins.append(index)
+        code.extend((HALT, 0, 0, 0))
+        origins.append(len(intermediate))
+        return cls(code, registers, variables, origins)
+
+
+def parse_number(text: str) -> int | float:
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def wrap_int(value: int) -> int:
+    """An int result cut to INT_BITS bits, as two's complement"""
+    return ((value - INT_MIN) & ((1 << INT_BITS) - 1)) + INT_MIN
+
+
+def wrap(value):
+    """A result as the machine keeps it: ints wrapped, anything else as is"""
+    if type(value) is int and not INT_MIN <= value <= INT_MAX:
+        return wrap_int(value)
+    return value
+
+
+def format_value(value) -> str:
+    """A value as cout writes it"""
+    if isinstance(value, float):
+        return f"{value:g}"
+    return str(int(value))  # comparisons leave bools
+
+
+def divide(left, right):
+    if isinstance(left, int) and isinstance(right, int):
+        quotient = abs(left) // abs(right)
+        return quotient if (left < 0) == (right < 0) else -quotient
+    return left / right
+
+
+def modulo(left, right):
+    if isinstance(left, int) and isinstance(right, int):
+        return left - right * divide(left, right)
+    return math.fmod(left, right)
+
+
+def power(left, right):
+    """
+    An int to an int power is a wrapped int, computed modulo 2 ** INT_BITS
+    so that large exponents take no time: 1 / left ** -right for a negative
+    one. Other powers are floats.
+    """
+    if isinstance(left, int) and isinstance(right, int):
+        if right >= 0:
+            return wrap_int(pow(left, right, 1 << INT_BITS))
+        if left == 0:
+            raise ZeroDivisionError("0 raised to a negative power")
+        return left**-right if abs(left) == 1 else 0
+    return math.pow(left, right)
+
+
+class VirtualMachine:
+    """
+    Runs Bytecode. The program is run in pieces by calling run until
+    running is False; the output, the number of instructions run and the
+    time they took are kept along the way.
+    """
+
+    def __init__(
+        self,
+        bytecode: Bytecode,
+        inputs=(),
+        step_budget: int = DEFAULT_STEP_BUDGET,
+    ):
+        self.bytecode = bytecode
+        self.code = bytecode.code.tolist()  # list items are read faster
+        self.registers = list(bytecode.registers)
+        self.inputs = iter(inputs)  # values read by cin, as text
+        self.step_budget = step_budget
+        self.pc = 0  # address of the next instruction
+        self.steps = 0
+        self.done = 0  # instructions run by the last call to execute
+        self.elapsed = 0.0
+        self.output = []
+        self.output_lines = 0
+        self.running = True
+        self.error = None  # why the program stopped early, if it did
+
+    def instructions_per_second(self) -> float:
+        return self.steps / self.elapsed if self.elapsed else 0.0
+
+    def run(self, steps: int | None = None):
+        """Runs at most steps more instructions, or until the program stops."""
+        if not self.running:
+            return
+        left = self.step_budget - self.steps
+        limit = left if steps is None else min(steps, left)
+        started = time.perf_counter()
+        try:
+            done = self.execute(limit)
+        except RuntimeFault as fault:
+            done = self.stop(f"{fault}, at {self.location()}")
+        except (ArithmeticError, ValueError) as e:
+            done = self.stop(f"{type(e).__name__}: {e}, at {self.location()}")
+        self.elapsed += time.perf_counter() - started
+        self.steps += done
+        if self.running and self.steps >= self.step_budget:
+            self.running = False
+            self.error = (
+                f"Stopped after the step budget of {self.step_budget} instructions"
+            )
+
+    def location(self) -> str:
+        return f"instruction {self.bytecode.origins[self.pc // 4]}"
+
+    def stop(self, error: str) -> int:
+        self.running = False
+        self.error = error
+        return self.done
+
+    def read(self) -> str:
+        text = next(self.inputs, None)
+        if text is None:
+            raise RuntimeFault("No input left for cin")
+        return text
+
+    def execute(self, limit: int) -> int:
+        """
+        The dispatch loop. Returns how many instructions it ran. Opcodes are
+        compared as literal ints, the most frequent ones first.
+        """
+        code = self.code
+        r = self.registers
+        int_min = INT_MIN
+        int_max = INT_MAX
+        pc = self.pc
+        steps = 0
+        try:
+            for steps in range(limit):
+                op = code[pc]
+                if op == 0:  # COPY
+                    r[code[pc + 1]] = r[code[pc + 2]]
+                    pc += 4
+                elif op == 1:  # PLUS
+                    v = r[code[pc + 2]] + r[code[pc + 3]]
+                    if not int_min <= v <= int_max and type(v) is int:
+                        v = wrap_int(v)
+                    r[code[pc + 1]] = v
+                    pc += 4
+                elif op == 2:  # MINUS
+                    v = r[code[pc + 2]] - r[code[pc + 3]]
+                    if not int_min <= v <= int_max and type(v) is int:
+                        v = wrap_int(v)
+                    r[code[pc + 1]] = v
+                    pc += 4
+                elif op == 17:  # IF_FALSE
+                    pc = code[pc + 1] if not r[code[pc + 2]] else pc + 4
+                elif op == 16:  # GOTO
+                    pc = code[pc + 1]
+                elif op == 7:  # LT
+                    r[code[pc + 1]] = r[code[pc + 2]] < r[code[pc + 3]]
+                    pc += 4
+                elif op == 9:  # GT
+                    r[code[pc + 1]] = r[code[pc + 2]] > r[code[pc + 3]]
+                    pc += 4
+                elif op == 8:  # LE
+                    r[code[pc + 1]] = r[code[pc + 2]] <= r[code[pc + 3]]
+                    pc += 4
+                elif op == 10:  # GE
+                    r[code[pc + 1]] = r[code[pc + 2]] >= r[code[pc + 3]]
+                    pc += 4
+                elif op == 3:  # TIMES
+                    v = r[code[pc + 2]] * r[code[pc + 3]]
+                    if not int_min <= v <= int_max and type(v) is int:
+                        v = wrap_int(v)
+                    r[code[pc + 1]] = v
+                    pc += 4
+                elif op == 18:  # IF_TRUE
+                    pc = code[pc + 1] if r[code[pc + 2]] else pc + 4
+                elif op == 11:  # EQ
+                    r[code[pc + 1]] = r[code[pc + 2]] == r[code[pc + 3]]
+                    pc += 4
+                elif op == 12:  # NE
+                    r[code[pc + 1]] = r[code[pc + 2]] != r[code[pc + 3]]
+                    pc += 4
+                elif op == 4:  # DIVIDE
+                    v = divide(r[code[pc + 2]], r[code[pc + 3]])
+                    if not int_min <= v <= int_max and type(v) is int:
+                        v = wrap_int(v)
+                    r[code[pc + 1]] = v
+                    pc += 4
+                elif op == 5:  # MOD
+                    r[code[pc + 1]] = modulo(r[code[pc + 2]], r[code[pc + 3]])
+                    pc += 4
+                elif op == 6:  # POW
+                    r[code[pc + 1]] = power(r[code[pc + 2]], r[code[pc + 3]])
+                    pc += 4
+                elif op == 19:  # READ
+                    r[code[pc + 1]] = wrap(parse_number(self.read()))
+                    pc += 4
+                elif op == 20:  # WRITE
+                    if self.output_lines < OUTPUT_LIMIT:
+                        self.output.append(format_value(r[code[pc + 2]]))
+                    self.output_lines += 1
+                    pc += 4
+                elif op == 22:  # COPY_FLOAT
+                    r[code[pc + 1]] = float(r[code[pc + 2]])
+                    pc += 4
+                elif op == 23:  # READ_INT, truncating like an int conversion
+                    r[code[pc + 1]] = wrap(int(parse_number(self.read())))
+                    pc += 4
+                elif op == 24:  # READ_FLOAT
+                    r[code[pc + 1]] = float(parse_number(self.read()))
+                    pc += 4
+                else:  # HALT
+                    self.running = False
+                    break
+            else:
+                steps = limit  # the loop ran out before the program did
+        finally:
+            # Kept for the next run and for reporting a fault
+            self.pc = pc
+            self.done = steps
+        return steps
+
+    def variable_values(self) -> dict[str, int | float]:
+        registers = self.registers
+        return {
+            name: registers[index]
+            for name, index in self.bytecode.variables.items()
+        }
+
+    def report(self) -> str:
+        """Output and statistics of the run, as shown in the Resultados panel."""
+        lines = list(self.output)
+        if self.output_lines > len(self.output):
+            lines.append(f"... {self.output_lines - len(self.output)} more lines")
+        lines.append("")
+        if self.error is not None:
+            lines.append(self.error)
+        lines.append(
+            f"{self.steps} instructions in {self.elapsed * 1000:.1f} ms "
+            f"({self.instructions_per_second():,.0f} instructions/s)"
+        )
+        values = self.variable_values()
+        if values:
+            lines.append("")
+            width = max(len(name) for name in values)
+            for name, value in values.items():
+                lines.append(f"{name:<{width}} = {format_value(value)}")
+        return "\n".join(lines)
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The modules of the compiler import each other from src, as main.py runs them
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
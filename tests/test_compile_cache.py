@@ -0,0 +1,49 @@
+import os
+
+from compile_cache import CompileCache
+
+
+def test_put_scans_the_directory_only_when_the_count_passes_the_limit(
+    tmp_path, monkeypatch
+):
+    cache = CompileCache(tmp_path, max_bytes=1 << 20)
+    scans = []
+    evict = cache.evict
+    monkeypatch.setattr(cache, "evict", lambda: scans.append(evict()))
+    for index in range(50):
+        cache.compile(f"main {{ int x = {index}; }}".encode())
+    assert len(scans) == 1  # the first put, which counts what is there
+    assert cache.total_bytes == sum(p.stat().st_size for p in tmp_path.iterdir())
+
+
+def test_put_counts_an_overwritten_entry_once(tmp_path):
+    cache = CompileCache(tmp_path, max_bytes=1 << 20)
+    content = b"main { int x = 1; }"
+    cache.compile(content)
+    cache.put(content, cache.get(content))  # as another worker storing it
+    assert cache.total_bytes == sum(p.stat().st_size for p in tmp_path.iterdir())
+
+
+def test_put_evicts_least_recently_used_entries_beyond_the_limit(tmp_path):
+    cache = CompileCache(tmp_path, max_bytes=1 << 20)
+    contents = [f"main {{ int x = {index}; }}".encode() for index in range(5)]
+    paths = [cache.path(cache.key(content)) for content in contents]
+    for age, content in enumerate(contents[:4]):
+        cache.compile(content)
+        os.utime(paths[age], (1000 + age, 1000 + age))
+    assert cache.get(contents[0]) is not None  # the oldest, now the newest
+    # Room for three entries, so putting a fifth evicts two
+    cache.max_bytes = cache.total_bytes * 3 // 4
+    cache.compile(contents[4])
+    assert [path.exists() for path in paths] == [True, False, False, True, True]
+    assert cache.total_bytes == sum(p.stat().st_size for p in tmp_path.iterdir())
+
+
+def test_results_of_each_parser_backend_are_kept_apart(tmp_path):
+    content = b"main { int x = ; }"
+    recursive = CompileCache(tmp_path)
+    table = CompileCache(tmp_path, backend="table")
+    recursive.compile(content)
+    assert table.get(content) is None
+    assert table.compile(content)[3] == table.get(content)[3]
+    assert len(list(tmp_path.glob("*.pickle"))) == 2
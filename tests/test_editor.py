@@ -0,0 +1,49 @@
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+pytest.importorskip("PyQt5.Qsci")
+
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+
+from components.editor import Editor  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def editor():
+    app = QApplication.instance() or QApplication([])
+    editor = Editor()
+    yield editor
+    editor.close()
+    app.processEvents()
+
+
+def session_text(editor: Editor) -> str:
+    return "\n".join(editor.lexer_session.lines)
+
+
+def test_deleting_lines_keeps_the_session_in_sync(editor):
+    editor.setText("".join(f"int x{i} = {i}; /* {i} */\n" for i in range(50)))
+    editor.recolor()
+    assert session_text(editor) == editor.text()
+
+    editor.setSelection(10, 4, 25, 2)
+    editor.removeSelectedText()
+    editor.recolor()
+    assert session_text(editor) == editor.text()
+
+    editor.setSelection(3, 0, 30, 0)
+    editor.removeSelectedText()
+    editor.recolor()
+    assert session_text(editor) == editor.text()
+    assert len(editor.lexer_session.lines) == editor.lines()
+
+
+def test_undoing_a_deletion_keeps_the_session_in_sync(editor):
+    editor.setText("".join(f"float f{i} = {i}.5;\n" for i in range(50)))
+    editor.setSelection(5, 0, 45, 0)
+    editor.removeSelectedText()
+    editor.undo()
+    editor.recolor()
+    assert session_text(editor) == editor.text()
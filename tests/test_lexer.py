@@ -0,0 +1,147 @@
+import io
+from pathlib import Path
+
+import pytest
+
+from lexer import get_lexical_analysis, get_lexical_analysis_from_text, iter_tokens
+
+TEST_LEXICO = Path(__file__).parent.parent / "test_lexico.txt"
+
+
+def as_tuples(tokens):
+    return [(token.type, token.value, token.lineno, token.lexpos) for token in tokens]
+
+
+def lex(text):
+    tokens, errors = get_lexical_analysis_from_text(text)
+    return as_tuples(tokens), as_tuples(errors)
+
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+def test_test_lexico(use_mmap):
+    tokens, errors = get_lexical_analysis(TEST_LEXICO, use_mmap=use_mmap)
+    tokens = as_tuples(tokens)
+    assert as_tuples(errors) == [
+        ("ERROR", "Invalid character => @", 1, 9),
+        ("ERROR", "Invalid character => .", 1, 27),
+        ("ERROR", "Invalid character => .", 2, 6),
+        ("ERROR", "Invalid character => &", 20, 14),
+        ("ERROR", "Invalid character => &", 20, 15),
+    ]
+    assert len(tokens) == 239
+    assert tokens[:12] == [
+        ("MAIN", "main", 1, 1),
+        ("IDENTIFIER", "sum", 1, 6),
+        ("IDENTIFIER", "r", 1, 10),
+        ("REAL_NUMBER", "3.14", 1, 12),
+        ("PLUS", "+", 1, 16),
+        ("MAIN", "main", 1, 17),
+        ("RPAREN", ")", 1, 21),
+        ("IF", "if", 1, 22),
+        ("LBRACE", "{", 1, 24),
+        ("INTEGER_NUMBER", "32", 1, 25),
+        ("IDENTIFIER", "algo", 1, 28),
+        ("REAL_NUMBER", "34.34", 2, 1),
+    ]
+    # A keyword that ends its line is still a token
+    assert ("ELSE", "else", 19, 3) in tokens
+
+
+def test_test_lexico_in_chunks():
+    tokens, errors = get_lexical_analysis(TEST_LEXICO)
+    with open(TEST_LEXICO, encoding="utf-8") as file:
+        streamed = as_tuples(iter_tokens(file, chunk_size=16))
+    assert streamed == sorted(
+        as_tuples(tokens) + as_tuples(errors), key=lambda token: token[2:]
+    )
+
+
+def test_minus_after_a_number_is_an_operator():
+    assert lex("x = 3-2;")[0][2:5] == [
+        ("INTEGER_NUMBER", "3", 1, 5),
+        ("MINUS", "-", 1, 6),
+        ("INTEGER_NUMBER", "2", 1, 7),
+    ]
+    assert lex("x = 3 -2;")[0][2:5] == [
+        ("INTEGER_NUMBER", "3", 1, 5),
+        ("MINUS", "-", 1, 7),
+        ("INTEGER_NUMBER", "2", 1, 8),
+    ]
+
+
+def test_minus_elsewhere_is_folded_into_the_number():
+    # The folded number keeps the position of its digits
+    assert lex("x = a - -2;")[0][2:5] == [
+        ("IDENTIFIER", "a", 1, 5),
+        ("MINUS", "-", 1, 7),
+        ("NEGATIVE_INTEGER_NUMBER", "-2", 1, 10),
+    ]
+    assert lex("y=-1.5;")[0][1:3] == [
+        ("ASSIGN", "=", 1, 2),
+        ("NEGATIVE_REAL_NUMBER", "-1.5", 1, 4),
+    ]
+    assert lex("a = b-1;")[0][2:4] == [
+        ("IDENTIFIER", "b", 1, 5),
+        ("NEGATIVE_INTEGER_NUMBER", "-1", 1, 7),
+    ]
+
+
+def test_unclosed_block_comment_across_chunks():
+    text = "int a; /* never\nclosed " + "x " * 50
+    for chunk_size in (1, 3, 7, 16):
+        assert as_tuples(iter_tokens(io.StringIO(text), chunk_size=chunk_size)) == [
+            ("INT", "int", 1, 1),
+            ("IDENTIFIER", "a", 1, 5),
+            ("SEMICOLON", ";", 1, 6),
+            ("ERROR", "Block comment not closed", 1, 8),
+        ]
+
+
+def test_closed_block_comment_spans_lines():
+    assert lex("x = 1 /* a\nb */ + 2;") == (
+        [
+            ("IDENTIFIER", "x", 1, 1),
+            ("ASSIGN", "=", 1, 3),
+            ("INTEGER_NUMBER", "1", 1, 5),
+            ("PLUS", "+", 2, 6),
+            ("INTEGER_NUMBER", "2", 2, 8),
+            ("SEMICOLON", ";", 2, 9),
+        ],
+        [],
+    )
+
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+def test_crlf_line_endings(tmp_path, use_mmap):
+    path = tmp_path / "crlf.txt"
+    path.write_bytes(b"int a;\r\nfloat b; // c\r\na = 1;\r\n")
+    tokens, errors = get_lexical_analysis(path, use_mmap=use_mmap)
+    assert as_tuples(errors) == []
+    assert as_tuples(tokens) == [
+        ("INT", "int", 1, 1),
+        ("IDENTIFIER", "a", 1, 5),
+        ("SEMICOLON", ";", 1, 6),
+        ("FLOAT", "float", 2, 1),
+        ("IDENTIFIER", "b", 2, 7),
+        ("SEMICOLON", ";", 2, 8),
+        ("IDENTIFIER", "a", 3, 1),
+        ("ASSIGN", "=", 3, 3),
+        ("INTEGER_NUMBER", "1", 3, 5),
+        ("SEMICOLON", ";", 3, 6),
+    ]
+
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+def test_non_ascii_invalid_character(tmp_path, use_mmap):
+    path = tmp_path / "accents.txt"
+    path.write_text("int ñ;\na = 1 é 2;\n", encoding="utf-8")
+    tokens, errors = get_lexical_analysis(path, use_mmap=use_mmap)
+    # Positions count characters, not bytes
+    assert as_tuples(errors) == [
+        ("ERROR", "Invalid character => ñ", 1, 5),
+        ("ERROR", "Invalid character => é", 2, 7),
+    ]
+    assert as_tuples(tokens)[-2:] == [
+        ("INTEGER_NUMBER", "2", 2, 9),
+        ("SEMICOLON", ";", 2, 10),
+    ]
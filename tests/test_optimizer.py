@@ -0,0 +1,32 @@
+from compile_cache import compile_text
+from optimizer import ConstantFolder
+from semantic import SemanticAnalyzer
+
+
+def fold(source: str):
+    ast = compile_text(source)[2]
+    SemanticAnalyzer(ast).analyze()
+    return ConstantFolder(ast).fold()
+
+
+def initial_value(source: str):
+    program = fold(source)
+    declaration = next(
+        node for _, node in program.walk() if node.name == "INITIALIZATION"
+    )
+    return declaration.children[0]
+
+
+def test_int_power_with_negative_exponent_folds_to_an_int():
+    value = initial_value("main { int x = 2 ^ -1; }")
+    assert (value.name, value.value, value.type) == ("Number", "0", "int")
+
+
+def test_float_power_folds_to_a_float():
+    value = initial_value("main { float x = 2.0 ^ -1; }")
+    assert (value.name, value.value, value.type) == ("Number", "0.5", "float")
+
+
+def test_int_arithmetic_folds_wrapped_like_the_machine():
+    value = initial_value("main { int x = 2147483647 + 1; }")
+    assert value.value == "-2147483648"
@@ -0,0 +1,14 @@
+import pytest
+
+from lexer import get_lexical_analysis_from_text
+from parser_s import Parser
+from table_parser import TableParser
+
+
+@pytest.mark.parametrize("parser_class", [Parser, TableParser])
+@pytest.mark.parametrize("source", ["", "  \n\t", "/* c */", "// c\n"])
+def test_input_without_tokens_ends_unexpectedly(parser_class, source):
+    parser = parser_class(iter(get_lexical_analysis_from_text(source)[0]))
+    assert parser.parse() is None
+    assert parser.errors == ["Unexpected end of input"]
+    assert parser.error_tokens == [None]
@@ -0,0 +1,26 @@
+from compile_cache import compile_text
+from semantic import SemanticAnalyzer
+
+
+def errors(source: str) -> list[str]:
+    analyzer = SemanticAnalyzer(compile_text(source)[2])
+    analyzer.analyze()
+    return analyzer.errors
+
+
+def test_logical_operators_take_parenthesized_comparisons():
+    assert errors("main { int x; int y; if ((x < 1) and (y > 2)) { } }") == []
+
+
+def test_logical_operators_bind_tighter_than_comparisons():
+    # Parsed as (x < (1 and y)) > 2
+    assert errors("main { int x; int y; if (x < 1 and y > 2) { } }")[0] == (
+        "Operator 'and' needs bool operands, not int and int (comparisons "
+        "around it need parentheses), at line 1, position 32"
+    )
+
+
+def test_logical_operators_reject_numeric_operands():
+    assert errors("main { int x; if ((x > 0) or x) { } }")[0].startswith(
+        "Operator 'or' needs bool operands, not bool and int"
+    )
@@ -0,0 +1,101 @@
+from compile_cache import compile_text
+from intermediate_code import CodeGenerator
+from semantic import SemanticAnalyzer
+from virtual_machine import (
+    INT_MAX,
+    INT_MIN,
+    RUN_CHUNK,
+    Bytecode,
+    VirtualMachine,
+)
+
+
+def start(source: str, inputs=(), step_budget: int = 1_000_000) -> VirtualMachine:
+    ast = compile_text(source)[2]
+    analyzer = SemanticAnalyzer(ast)
+    analyzer.analyze()
+    assert analyzer.errors == []
+    code = CodeGenerator(ast).generate()
+    return VirtualMachine(Bytecode.from_intermediate_code(code), inputs, step_budget)
+
+
+def run(source: str, inputs=()) -> VirtualMachine:
+    machine = start(source, inputs)
+    while machine.running:
+        machine.run()
+    assert machine.error is None
+    return machine
+
+
+def test_int_constant_copied_into_float_divides_as_float():
+    machine = run("main { float f = 3; cout f / 2; }")
+    assert machine.output == ["1.5"]
+
+
+def test_float_variable_starts_at_float_zero():
+    machine = run("main { float f; cout f / 2; }")
+    assert machine.variable_values() == {"f": 0.0}
+
+
+def test_cin_into_int_truncates():
+    machine = run("main { int x; cin x; cout x; }", ["7.5"])
+    assert machine.output == ["7"]
+    assert machine.variable_values()["x"] == 7
+
+
+def test_cin_into_float_reads_a_float():
+    machine = run("main { double d; cin d; cout d / 2; }", ["3"])
+    assert machine.output == ["1.5"]
+
+
+def test_int_power_with_negative_exponent_stays_int():
+    machine = run("main { int x = 2 ^ -1; int y = -1; y = y ^ -3; }")
+    assert machine.variable_values() == {"x": 0, "y": -1}
+
+
+def test_ints_wrap_around_like_a_cpp_int():
+    machine = run("main { int x = 2147483647; int y = 65536; x++; y = y * y; }")
+    assert machine.variable_values() == {"x": INT_MIN, "y": 0}
+
+
+def test_int_power_wraps_without_computing_the_whole_power():
+    machine = run("main { int x = 3 ^ 1000000000; int y = 2 ^ 31; }")
+    assert machine.variable_values() == {"x": 783845377, "y": INT_MIN}
+
+
+def test_runaway_multiplication_reaches_the_step_budget():
+    machine = start("main { int x = 2; while (1 < 2) { x = x * x; } }")
+    while machine.running:
+        machine.run(RUN_CHUNK)
+        # Every chunk ends soon, so a cancelled run stops soon
+        assert machine.elapsed < 10
+    assert machine.steps == machine.step_budget
+    assert INT_MIN <= machine.variable_values()["x"] <= INT_MAX
+
+
+def test_and_guards_a_division_by_zero():
+    machine = run(
+        "main { int x = 0; int y = 5;"
+        " if ((x != 0) and (y / x > 1)) { cout 1; } else { cout 0; } }"
+    )
+    assert machine.output == ["0"]
+
+
+def test_false_left_operand_of_and_skips_the_right_one():
+    # Evaluating the right operand would divide by zero
+    machine = run("main { int x = 0; if ((x > 0) and (1 / x > 0)) { cout 1; } }")
+    assert machine.output == []
+
+
+def test_true_left_operand_of_or_skips_the_right_one():
+    machine = run("main { int x = 0; if ((x == 0) or (1 / x > 0)) { cout 1; } }")
+    assert machine.output == ["1"]
+
+
+def test_logical_operators_evaluate_the_right_operand_when_needed():
+    machine = run(
+        "main { int x = 2;"
+        " if ((x > 0) and (x < 1)) { cout 1; }"
+        " if ((x < 0) or (x > 1)) { cout 2; } }"
+    )
+    assert machine.output == ["2"]